@@ -3,6 +3,7 @@ import os
 import sys
 from pathlib import Path
 import asyncio
+import contextlib
 import traceback
 from collections import defaultdict
 import logging
@@ -12,6 +13,7 @@ load_dotenv()
 from src.config import Config
 from src.agents import DataCollector, DataAnalyzer, ReportGenerator
 from src.memory import Memory
+from src.tools.financial.prefetch import prefetch_company_data
 from src.utils import setup_logger
 from src.utils import get_logger
 get_logger().set_agent_context('runner', 'main')
@@ -58,6 +60,14 @@ async def run_report(resume: bool = True, max_concurrent: int = None):
         memory.load()
         logger.info("Memory state loaded")
     
+    # Warm the tool cache for a US target while the LLM plans tasks. US tickers
+    # are canonical, so collectors' later calls hit the same cache keys.
+    prefetch_task = None
+    if str(config.config.get('market', '')).upper() == 'US' and config.config.get('stock_code'):
+        prefetch_task = asyncio.create_task(
+            prefetch_company_data(config.config['stock_code'], 'US')
+        )
+    
     # Generate additional collect and analysis tasks using LLM if not already generated
     research_query = f"Research target: {config.config['target_name']} (ticker: {config.config['stock_code']}), target type: {config.config.get('target_type', 'company')}"
     
@@ -166,7 +176,7 @@ async def run_report(resume: bool = True, max_concurrent: int = None):
 
 
     # Use memory to obtain/create the required agents (records tasks internally)
-    agents_info = []
+    created_agents = []
     for task_info in tasks_to_run:
         agent = await memory.get_or_create_agent(
             agent_class=task_info['agent_class'],
@@ -175,13 +185,20 @@ async def run_report(resume: bool = True, max_concurrent: int = None):
             priority=task_info['priority'],
             **task_info['agent_kwargs']
         )
-        # Retrieve the persisted priority (may differ on resume)
-        actual_priority = task_info['priority']
-        for saved_task in memory.task_mapping:
-            if saved_task.get('agent_id') == agent.id:
-                actual_priority = saved_task.get('priority', task_info['priority'])
-                break
-        
+        created_agents.append((agent, task_info))
+
+    # Retrieve the persisted priority (may differ on resume); index once
+    # after creation since get_or_create_agent appends to task_mapping
+    saved_priorities = {}
+    for saved_task in memory.task_mapping:
+        if 'agent_id' in saved_task:
+            saved_priorities.setdefault(saved_task['agent_id'], saved_task.get('priority'))
+
+    agents_info = []
+    for agent, task_info in created_agents:
+        actual_priority = saved_priorities.get(agent.id)
+        if actual_priority is None:
+            actual_priority = task_info['priority']
         agents_info.append({
             'agent': agent,
             'task_input': task_info['task_input'],
@@ -189,8 +206,12 @@ async def run_report(resume: bool = True, max_concurrent: int = None):
         })
     
 
-    memory.save()
+    memory.schedule_save()
+    
     
+    if prefetch_task is not None:
+        prefetched = await prefetch_task
+        logger.info(f"Prefetched {len(prefetched)} tool result(s) for {config.config['stock_code']}")
     
     # Execute tasks by priority tier (parallel within a tier)
     agents_info.sort(key=lambda x: x['priority'])
@@ -209,13 +230,13 @@ async def run_report(resume: bool = True, max_concurrent: int = None):
         logger.info(f"\nExecuting priority {priority} group ({len(group)} task(s){concurrency_info})")
         
         # Skip tasks that already finished
-        tasks_to_run = []
-        for agent_info in group:
-            agent = agent_info['agent']
-            if agent_resume and resume and memory.is_agent_finished(agent.id):
-                logger.info(f"Agent {agent.id} already completed; skip")
-                continue
-            tasks_to_run.append(agent_info)
+        finished = (
+            memory.finished_agent_ids([agent_info['agent'].id for agent_info in group])
+            if agent_resume and resume else frozenset()
+        )
+        tasks_to_run = [agent_info for agent_info in group if agent_info['agent'].id not in finished]
+        if finished:
+            logger.info(f"Already completed; skip: {', '.join(sorted(finished))}")
         
         if not tasks_to_run:
             logger.info(f"All tasks with priority {priority} are complete")
@@ -225,13 +246,13 @@ async def run_report(resume: bool = True, max_concurrent: int = None):
         semaphore = asyncio.Semaphore(max_concurrent) if max_concurrent else None
         
         async def run_agent_with_limit(agent_info):
-            """Run agent with semaphore limit if configured"""
+            """Run agent under the concurrency limit and the agent-launch rate limit"""
             agent = agent_info['agent']
-            if semaphore:
-                async with semaphore:
-                    logger.info(f"Starting agent {agent.id}")
-                    return await agent.async_run(**agent_info['task_input'])
-            else:
+            # Stagger launches so a tier does not burst the LLM/data APIs at once.
+            # Reserve the launch slot before taking a concurrency slot, so no
+            # slot sits idle while its agent waits for its turn.
+            await config.rate_limiter.acquire("agent_launch")
+            async with semaphore or contextlib.nullcontext():
                 logger.info(f"Starting agent {agent.id}")
                 return await agent.async_run(**agent_info['task_input'])
         
@@ -245,6 +266,8 @@ async def run_report(resume: bool = True, max_concurrent: int = None):
         # Wait for completion
         if async_tasks:
             results = await asyncio.gather(*async_tasks, return_exceptions=True)
+            # Failures keep one record each (with traceback); the rest are summarized per tier
+            completed = []
             for agent_info, result in zip(tasks_to_run, results):
                 agent = agent_info['agent']
                 if isinstance(result, Exception):
@@ -252,12 +275,16 @@ async def run_report(resume: bool = True, max_concurrent: int = None):
                     tb_str = ''.join(traceback.format_exception(type(result), result, result.__traceback__))
                     logger.error(f"  Task failed: Agent {agent.id}, error: {result}\n{tb_str}")
                 else:
-                    logger.info(f"  Task finished: Agent {agent.id}")
+                    completed.append(agent.id)
+            if completed:
+                logger.info(f"  Tasks finished: {', '.join(completed)}")
         
         logger.info(f"Priority {priority} group finished\n")
     
     # Persist final state
+    await memory.flush_save()
     memory.save()
+    await asyncio.gather(*(llm.aclose() for llm in config.llm_dict.values()))
     logger.info("All tasks completed")
 
 
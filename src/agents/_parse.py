@@ -0,0 +1,86 @@
+"""Pure helpers for turning LLM output and code-execution results into agent steps.
+
+Kept free of heavy imports so they can be used (and tested) without loading
+the agent, tool and LLM stack; ``BaseAgent`` delegates to them.
+"""
+
+import re
+from typing import Any, Dict
+
+# Action tags such as <execute>...</execute>; the closing tag must match
+_TAG_RE = re.compile(r"<([\w_]+)>(.*?)</\1>", re.DOTALL)
+_TAG_NAME_RE = re.compile(r"[\w_]+")
+# Reasoning-block delimiters, replaced by newlines so their tags never match
+_THINK_TAG_RE = re.compile(r"</?think(?:ing)?>")
+
+
+def parse_llm_response(response: str) -> tuple[str, str]:
+    """Parse the LLM response to extract action tags."""
+    response = _THINK_TAG_RE.sub("\n", response)
+    parsed = _parse_single_tag(response)
+    if parsed is None:
+        # Only the last tag counts; keep it without collecting every match
+        match = None
+        for match in _TAG_RE.finditer(response):
+            pass
+
+        if match is None:
+            return "final", response
+        parsed = match.group(1), match.group(2)
+
+    tag_name, content = parsed
+    if tag_name == 'execute':
+        tag_name = 'code'
+    if tag_name == 'final_result':
+        tag_name = 'final'
+    content_string = content.strip()  # Remove surrounding whitespace
+
+    return tag_name, content_string
+
+
+def _parse_single_tag(response: str) -> tuple[str, str] | None:
+    """Fast path for the usual response shape: exactly one ``<tag>...</tag>`` pair.
+
+    Finds the only closing tag with ``rfind`` and its opening tag just before
+    it. Returns ``None`` whenever the text has more than one closing tag or
+    repeats the opening tag, so ``_TAG_RE`` decides every ambiguous case.
+    """
+    close_start = response.rfind("</")
+    if close_start == -1 or response.find("</") != close_start:
+        return None
+    close_end = response.find(">", close_start)
+    if close_end == -1:
+        return None
+    tag_name = response[close_start + 2:close_end]
+    if not _TAG_NAME_RE.fullmatch(tag_name):
+        return None
+    open_tag = f"<{tag_name}>"
+    open_start = response.rfind(open_tag, 0, close_start)
+    if open_start == -1 or response.find(open_tag) != open_start:
+        return None
+    return tag_name, response[open_start + len(open_tag):close_start]
+
+
+def format_execution_result(result: Dict[str, Any]) -> str:
+    """Render a code-executor result as feedback text for the LLM."""
+    feedback = []
+
+    if result["error"] is False:
+        feedback.append("Code execution: success\n")
+
+        if result["stdout"]:
+            feedback.append(f"Console output:\n{result['stdout']}\n\n")
+
+        if result.get("variables"):
+            feedback.append("New variables:")
+            for var_name, var_info in result["variables"].items():
+                feedback.append(f"  - {var_name}: {var_info}")
+        if result.get("additional_notes"):
+            feedback.append(f"Additional notes: {result['additional_notes']}\n")
+    else:
+        feedback.append("Code execution: failed\n")
+        if result["stderr"]:
+            feedback.append(f"Error message: {result['stderr']}\n")
+        if result["stdout"]:
+            feedback.append(f"Partial output: {result['stdout']}\n")
+    return "\n".join(feedback)
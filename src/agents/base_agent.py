@@ -5,13 +5,14 @@ import os
 import pickle
 import dill
 import uuid
-import re
 import asyncio
+import time
 from datetime import datetime
 from src.config import Config
 from src.tools import list_tools, get_tool_by_name
 from src.utils import AsyncCodeExecutor, get_logger
 from src.tools.base import Tool
+from src.agents._parse import format_execution_result, parse_llm_response
 
 
 _AGENT_REGISTRY: Dict[str, Type['BaseAgent']] = {}
@@ -438,7 +439,12 @@ class BaseAgent:
             elif 'us' in tool_name_lower and 'fred' not in tool_name_lower:
                 service = "yfinance"
             try:
-                bridge.run_async(rate_limiter.acquire(service))
+                # This runs on a code-executor thread that blocks on the tool
+                # call anyway, so sleep here rather than round-tripping
+                # through the bridge loop (and skip it when no wait is needed)
+                wait = rate_limiter.reserve(service)
+                if wait > 0:
+                    time.sleep(wait)
             except Exception as rl_err:
                 self.logger.debug(f"Rate limiter acquire for {service}: {rl_err}")
 
@@ -588,7 +594,7 @@ class BaseAgent:
             state=current_state,
             checkpoint_name=checkpoint_name,
         )
-        self.memory.save()
+        self.memory.schedule_save()
         
         return return_dict
 
@@ -597,23 +603,7 @@ class BaseAgent:
 
     def _parse_llm_response(self, response: str) -> tuple[str, str]:
         """Parse the LLM response to extract action tags."""
-        response = response.replace("<thinking>", "\n").replace("</thinking>", "\n")
-        response = response.replace("<think>", "\n").replace("</think>", "\n")
-        pattern = re.compile(r"<([\w_]+)>(.*?)</\1>", re.DOTALL)
-        matches = list(pattern.finditer(response))
-        
-        if not matches:
-            return "final", response
-        match = matches[-1]
-
-        tag_name = match.group(1)
-        if tag_name == 'execute':
-            tag_name = 'code'
-        if tag_name == 'final_result':
-            tag_name = 'final'
-        content_string = match.group(2).strip()  # Remove surrounding whitespace
-
-        return tag_name, content_string
+        return parse_llm_response(response)
 
     
     async def _execute_action(self, action_type: str, action_content: str):
@@ -654,27 +644,7 @@ class BaseAgent:
      
         
     def _format_execution_result(self, result: Dict[str, Any]) -> str:
-        feedback = []
-
-        if result["error"] is False:
-            feedback.append("Code execution: success\n")
-
-            if result["stdout"]:
-                feedback.append(f"Console output:\n{result['stdout']}\n\n")
-
-            if result.get("variables"):
-                feedback.append("New variables:")
-                for var_name, var_info in result["variables"].items():
-                    feedback.append(f"  - {var_name}: {var_info}")
-            if result.get("additional_notes"):
-                feedback.append(f"Additional notes: {result['additional_notes']}\n")
-        else:
-            feedback.append("Code execution: failed\n")
-            if result["stderr"]:
-                feedback.append(f"Error message: {result['stderr']}\n")
-            if result["stdout"]:
-                feedback.append(f"Partial output: {result['stdout']}\n")
-        return "\n".join(feedback)    
+        return format_execution_result(result)    
         
         
         
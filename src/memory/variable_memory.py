@@ -1,13 +1,20 @@
 import os
 import re
+import copy
 import json
 import dill
 import asyncio
 import datetime
+import threading
 import json_repair
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Literal, Type
 import numpy as np
+import pandas as pd
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
 
 from src.config import Config
 from src.tools import ToolResult
@@ -20,6 +27,52 @@ from src.tools.web.web_crawler import ClickResult
 from src.agents.search_agent.search_agent import DeepSearchResult
 
 
+@dataclass
+class _ArrowFrame:
+    """A DataFrame serialized as an Arrow IPC stream inside a memory checkpoint."""
+    payload: bytes
+
+    @classmethod
+    def from_pandas(cls, df: pd.DataFrame) -> '_ArrowFrame':
+        table = pa.Table.from_pandas(df)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return cls(sink.getvalue().to_pybytes())
+
+    def to_pandas(self) -> pd.DataFrame:
+        if pa is None:
+            raise ImportError("pyarrow is required to load DataFrames from this memory checkpoint")
+        return pa.ipc.open_stream(self.payload).read_all().to_pandas()
+
+
+def _pack_result(item):
+    """Return *item* with DataFrame data swapped for an ``_ArrowFrame`` (leaves *item* untouched)."""
+    if pa is None or not isinstance(getattr(item, 'data', None), pd.DataFrame):
+        return item
+    # Arrow stores column labels as strings, so e.g. int YEAR columns would
+    # come back as '2023'; keep those frames on the pickle path
+    if not all(isinstance(col, str) for col in item.data.columns):
+        return item
+    try:
+        frame = _ArrowFrame.from_pandas(item.data)
+    except Exception:
+        # Mixed-type object columns etc. cannot be expressed in Arrow; pickle as-is
+        return item
+    packed = copy.copy(item)
+    packed.data = frame
+    return packed
+
+
+def _unpack_result(item):
+    """Return *item* with ``_ArrowFrame`` data restored to a DataFrame (leaves *item* untouched)."""
+    if not isinstance(getattr(item, 'data', None), _ArrowFrame):
+        return item
+    unpacked = copy.copy(item)
+    unpacked.data = item.data.to_pandas()
+    return unpacked
+
+
 class Memory:
     def __init__(
         self,
@@ -41,42 +94,109 @@ class Memory:
         # Agent cache
         self._agents: Dict[str, BaseAgent] = {}  # agent_id -> agent instance
         self._restored_agents: Dict[str, BaseAgent] = {}  # share restored agents
+        self._finished_cache: Dict[str, tuple] = {}  # checkpoint path -> (mtime_ns, finished)
         
         # Logger
         self.logger = get_logger()
 
+        # Background save state (see schedule_save)
+        self._save_lock = threading.Lock()
+        self._save_task: Optional[asyncio.Task] = None
+        # _save_pending/_save_running are shared by callers (main or bridge
+        # loop thread) and the worker, so they only change under this lock
+        self._schedule_lock = threading.Lock()
+        self._save_pending = False
+        self._save_running = False
+
         target_type = config.config.get('target_type', 'general')
         report_type = 'financial' if 'financial' in target_type else 'general'
         self.prompt_loader = get_prompt_loader('memory', report_type=report_type)
 
     
-    def save(self, checkpoint_name: str = 'memory.pkl'):
-        """
-        Persist memory state to a checkpoint.
-        """
+    def _snapshot_state(self) -> dict:
+        """Shallow-copy the persisted containers so they can be written from another thread."""
         # Note: agent instances themselves are not saved—only metadata.
         # Agents are reloaded on demand from their checkpoints.
-        memory_state = {
-            'log': self.log,
-            'data': self.data,
-            'dependency': self.dependency,
-            'task_mapping': self.task_mapping,
+        return {
+            'log': list(self.log),
+            'data': list(self.data),
+            'dependency': {k: list(v) for k, v in self.dependency.items()},
+            'task_mapping': list(self.task_mapping),
             'data2embedding': {k: v.tolist() if isinstance(v, np.ndarray) else v 
                               for k, v in self.data2embedding.items()},
-            'generated_analysis_tasks': self.generated_analysis_tasks,
-            'generated_collect_tasks': self.generated_collect_tasks,
+            'generated_analysis_tasks': list(self.generated_analysis_tasks),
+            'generated_collect_tasks': list(self.generated_collect_tasks),
         }
+
+    def save(self, checkpoint_name: str = 'memory.pkl'):
+        """
+        Persist memory state to a checkpoint.
+        """
+        self._write_state(self._snapshot_state(), checkpoint_name)
+
+    def schedule_save(self, checkpoint_name: str = 'memory.pkl', delay: float = 0.5):
+        """
+        Request a save without blocking the event loop.
+
+        Calls within ``delay`` seconds are coalesced into a single write that
+        runs in a worker thread; at most one background save is in flight.
+        Falls back to a synchronous save when no event loop is running.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save(checkpoint_name)
+            return
+        with self._schedule_lock:
+            self._save_pending = True
+            if self._save_running:
+                return  # the running worker will pick the request up
+            self._save_running = True
+        self._save_task = loop.create_task(self._save_worker(checkpoint_name, delay))
+
+    async def flush_save(self):
+        """Wait for a background save started on the current loop to finish."""
+        task = self._save_task
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            await task
+
+    async def _save_worker(self, checkpoint_name: str, delay: float):
+        try:
+            while True:
+                await asyncio.sleep(delay)
+                with self._schedule_lock:
+                    self._save_pending = False
+                try:
+                    await asyncio.to_thread(self._write_state, self._snapshot_state(), checkpoint_name)
+                except Exception:
+                    pass  # already logged by _write_state
+                # Deciding to exit and clearing _save_running happen under the
+                # lock, so a request made meanwhile either sees the worker
+                # running and is picked up here, or starts a new worker
+                with self._schedule_lock:
+                    if not self._save_pending:
+                        self._save_running = False
+                        return
+        except BaseException:
+            with self._schedule_lock:
+                self._save_running = False
+            raise
+
+    def _write_state(self, memory_state: dict, checkpoint_name: str):
         target_path = os.path.join(self.save_dir, checkpoint_name)
         tmp_path = target_path + '.tmp'
         try:
-            self.logger.info(f"Memory save start: path={target_path}, log={len(self.log)}, data={len(self.data)}, tasks={len(self.task_mapping)}")
+            self.logger.info(f"Memory save start: path={target_path}, log={len(memory_state['log'])}, data={len(memory_state['data'])}, tasks={len(memory_state['task_mapping'])}")
         except Exception:
             pass
         
         try:
-            with open(tmp_path, 'wb') as f:
-                dill.dump(memory_state, f)
-            os.replace(tmp_path, target_path)
+            # DataFrames go through Arrow IPC, which is smaller and faster than pickling them
+            memory_state = dict(memory_state, data=[_pack_result(item) for item in memory_state['data']])
+            with self._save_lock:
+                with open(tmp_path, 'wb') as f:
+                    dill.dump(memory_state, f)
+                os.replace(tmp_path, target_path)
             try:
                 file_size = os.path.getsize(target_path) if os.path.exists(target_path) else 0
                 self.logger.info(f"Memory saved: path={target_path}, size={file_size} bytes")
@@ -103,7 +223,7 @@ class Memory:
                 memory_state = dill.load(f)
             
             self.log = memory_state.get('log', [])
-            self.data = memory_state.get('data', [])
+            self.data = [_unpack_result(item) for item in memory_state.get('data', [])]
             self.dependency = memory_state.get('dependency', {})
             self.task_mapping = memory_state.get('task_mapping', [])
             # Restore embeddings (convert lists back to numpy arrays)
@@ -278,15 +398,32 @@ class Memory:
             return False
         
         checkpoint_path = os.path.join(agent.cache_dir, checkpoint_name)
-        if not os.path.exists(checkpoint_path):
+        try:
+            mtime = os.stat(checkpoint_path).st_mtime_ns
+        except OSError:
             return False
         
+        # Checkpoints can be large; only reload one when it has been rewritten
+        cached = self._finished_cache.get(checkpoint_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
         try:
             with open(checkpoint_path, 'rb') as f:
                 state = dill.load(f)
-            return state.get('finished', False)
+            finished = bool(state.get('finished', False))
         except Exception:
             return False
+        self._finished_cache[checkpoint_path] = (mtime, finished)
+        return finished
+
+    def finished_agent_ids(self, agent_ids: Optional[List[str]] = None, checkpoint_name: str = 'latest.pkl') -> frozenset:
+        """Return the ids among *agent_ids* (default: all cached agents) whose checkpoint is finished."""
+        if agent_ids is None:
+            agent_ids = list(self._agents)
+        return frozenset(
+            agent_id for agent_id in agent_ids
+            if self.is_agent_finished(agent_id, checkpoint_name)
+        )
         
         
     def add_data(self, data: Any):
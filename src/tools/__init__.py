@@ -5,7 +5,6 @@ This module provides a unified interface for accessing all available financial d
 """
 
 import importlib
-import inspect
 from typing import Dict, List, Type, Any, Optional
 from .base import Tool, ToolResult
 
@@ -27,10 +26,15 @@ _TOOL_MODULES = [
     ".macro.us_macro",
 ]
 
+# Modules that failed to import above; _auto_register_tools skips them instead
+# of re-executing the import (and warning) a second time.
+_FAILED_MODULES: set[str] = set()
+
 for _mod in _TOOL_MODULES:
     try:
         _il.import_module(_mod, package=__name__)
     except ImportError as _e:
+        _FAILED_MODULES.add(f"{__name__}{_mod}")
         _w.warn(f"Skipping {_mod}: {_e}", stacklevel=2)
 
 # Global registry for all tools
@@ -42,13 +46,21 @@ _TOOL_CATEGORIES: Dict[str, List[str]] = {
     'web': []
 }
 
+# Tool class -> registered name. Lets repeated registration skip the
+# instantiation that is otherwise needed to read the tool name.
+_CLASS_TO_NAME: Dict[Type[Tool], str] = {}
+
 def register_tool(tool_class: Type[Tool], category: str = 'general') -> Type[Tool]:
+    if tool_class in _CLASS_TO_NAME:
+        return tool_class
     try:
         tool_name = tool_class().name
         _REGISTERED_TOOLS[tool_name] = tool_class
+        _CLASS_TO_NAME[tool_class] = tool_name
         if category not in _TOOL_CATEGORIES:
             _TOOL_CATEGORIES[category] = []
-        _TOOL_CATEGORIES[category].append(tool_name)
+        if tool_name not in _TOOL_CATEGORIES[category]:
+            _TOOL_CATEGORIES[category].append(tool_name)
         
         # print(f"Registered tool: {tool_name} in category: {category}")
         
@@ -148,29 +160,38 @@ def _auto_register_tools():
     
     # print(f"Discovered {len(submodules)} submodules: {submodules}")
     
+    imported_modules = set()
     for submodule in submodules:
+        if submodule in _FAILED_MODULES:
+            continue
         try:
             # Convert module name to relative import format
             relative_name = submodule.replace(f"{__name__}.", "")
-            module = importlib.import_module(f'.{relative_name}', package=__name__)
-            
-            # Find all classes that inherit from Tool
-            for name, obj in inspect.getmembers(module, inspect.isclass):
-                if (issubclass(obj, Tool) and 
-                    obj != Tool and 
-                    obj.__module__ == module.__name__):
-                    
-                    # Determine category from submodule path
-                    category = 'general'  # default category
-                    if '.' in relative_name:
-                        # Extract category from path (e.g., 'financial.stock' -> 'financial')
-                        category = relative_name.split('.')[0]
-                    
-                    register_tool(obj, category)
-                    
+            importlib.import_module(f'.{relative_name}', package=__name__)
+            imported_modules.add(submodule)
         except Exception as e:
             print(f"Warning: Failed to import submodule {submodule}: {e}")
 
+    # Walk the Tool subclass tree instead of scanning every module attribute;
+    # only classes defined in a successfully imported submodule are registered.
+    # Depth-first so tools defined on a shared base keep their module order.
+    pending = list(reversed(Tool.__subclasses__()))
+    while pending:
+        obj = pending.pop()
+        pending.extend(reversed(obj.__subclasses__()))
+        # Underscore-prefixed classes are shared bases, not tools
+        if obj.__module__ not in imported_modules or obj.__name__.startswith('_'):
+            continue
+
+        # Determine category from submodule path
+        relative_name = obj.__module__.replace(f"{__name__}.", "")
+        category = 'general'  # default category
+        if '.' in relative_name:
+            # Extract category from path (e.g., 'financial.stock' -> 'financial')
+            category = relative_name.split('.')[0]
+
+        register_tool(obj, category)
+
 # Auto-register tools when module is imported
 _auto_register_tools()
 
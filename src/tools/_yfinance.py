@@ -0,0 +1,26 @@
+"""Shared yfinance import and network settings for the tool modules.
+
+yfinance already routes every ``Ticker`` through one process-wide HTTP session
+(curl_cffi with browser impersonation), so connections are pooled and must not
+be replaced with a custom ``session=``.  By default it does not retry
+transient network errors, which would otherwise surface as failed tool calls.
+"""
+
+import os
+
+try:
+    import yfinance as yf
+except ImportError:  # pragma: no cover - optional dependency
+    yf = None
+
+# Retries for transient connection errors; yfinance backs off 1s, 2s, 4s.
+# Override with ``FINSIGHT_YF_RETRIES`` (0 disables).
+YF_NETWORK_RETRIES = int(os.environ.get("FINSIGHT_YF_RETRIES", "3"))
+
+# ``yf.config`` only exists in newer yfinance releases.
+if yf is not None and hasattr(yf, "config"):
+    yf.config.network.retries = YF_NETWORK_RETRIES
+
+# Columns kept from ``Ticker.history`` output (after ``reset_index``).
+OHLCV_COLUMNS = ("Date", "Open", "High", "Low", "Close", "Volume")
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
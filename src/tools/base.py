@@ -1,6 +1,14 @@
 import pandas as pd
 import uuid
 
+
+def _require_stock_code(task) -> str:
+    """Return ``task.stock_code``, raising ``ValueError`` if the router left it empty."""
+    if task.stock_code is None:
+        raise ValueError("Stock code cannot be empty")
+    return task.stock_code
+
+
 class Tool:
     def __init__(
         self,
@@ -86,7 +94,9 @@ class ToolResult:
         return self.__str__()
     
     def __hash__(self):
-        return hash(self.name+self.description)
+        # str objects cache their own hash, so this is cheap on repeat calls
+        # without storing state that goes stale when name is reassigned
+        return hash((self.name, self.description))
     
     def __eq__(self, other):
         return self.name == other.name and self.description == other.description
\ No newline at end of file
@@ -0,0 +1,189 @@
+"""On-disk TTL cache for tool API responses.
+
+Remote data sources (akshare, efinance, yfinance, Eastmoney) are slow and the
+same ``(stock_code, market)`` pairs are requested many times within a report
+run.  ``cached_api`` memoizes an ``api_function`` on disk, keyed by the tool
+class and its bound call arguments::
+
+    class StockPrice(Tool):
+        @cached_api(ttl=15 * 60)
+        async def api_function(self, stock_code: str, market: str = "HK"):
+            ...
+
+Concurrent identical calls are coalesced: while a fetch is in flight, other
+callers with the same key await its result instead of hitting the network.
+Each of them gets its own deep copy, so in-place edits don't leak between
+callers.
+
+Entries are stored with ``dill`` under ``~/.finsight/tool_cache`` (override
+with ``FINSIGHT_CACHE_DIR``).  Set ``FINSIGHT_TOOL_CACHE=0`` to disable.
+Results whose ``data`` is ``None`` (failed fetches) are never cached.
+"""
+
+import asyncio
+import copy
+import functools
+import hashlib
+import inspect
+import os
+import time
+from typing import Any, Callable
+
+import dill
+
+DEFAULT_CACHE_DIR = os.path.join("~", ".finsight", "tool_cache")
+
+_MISSING = object()
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Return a stable sha256 hex digest for *parts*."""
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """Minimal file-per-key cache with per-entry expiry."""
+
+    def __init__(self, directory: str):
+        self.directory = os.path.expanduser(directory)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                expires_at, value = dill.load(f)
+        except Exception:
+            return default
+        if expires_at is not None and expires_at < time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return default
+        return value
+
+    def set(self, key: str, value: Any, expire: float | None = None) -> bool:
+        expires_at = time.time() + expire if expire else None
+        target_path = self._path(key)
+        tmp_path = f"{target_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                dill.dump((expires_at, value), f)
+            os.replace(tmp_path, target_path)
+            return True
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+
+    def clear(self) -> None:
+        if not os.path.isdir(self.directory):
+            return
+        # scandir yields entry.path directly and caches the file type from the
+        # directory listing, so no per-name join or extra stat is needed
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".pkl") and entry.is_file(follow_symlinks=False):
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+
+
+_cache: DiskCache | None = None
+_inflight: dict[str, asyncio.Future] = {}
+
+
+def get_tool_cache() -> DiskCache:
+    """Return (and lazily create) the module-level DiskCache."""
+    global _cache
+    if _cache is None:
+        _cache = DiskCache(os.environ.get("FINSIGHT_CACHE_DIR", DEFAULT_CACHE_DIR))
+    return _cache
+
+
+def _cache_enabled() -> bool:
+    return os.environ.get("FINSIGHT_TOOL_CACHE", "1").lower() not in ("0", "false", "no")
+
+
+def _is_cacheable(results: Any) -> bool:
+    if not isinstance(results, list) or not results:
+        return False
+    return all(getattr(item, "data", None) is not None for item in results)
+
+
+def _cancel_requested() -> bool:
+    """True if the current task itself has a pending cancellation (3.11+)."""
+    task = asyncio.current_task()
+    cancelling = getattr(task, "cancelling", None)
+    return bool(cancelling and cancelling())
+
+
+def cached_api(ttl: float) -> Callable:
+    """Cache an ``async api_function(self, **kwargs)`` on disk for *ttl* seconds."""
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            if not _cache_enabled():
+                return await func(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = sorted((k, v) for k, v in bound.arguments.items() if k != "self")
+            key = make_cache_key(type(self).__name__, params)
+
+            cache = get_tool_cache()
+            cached = cache.get(key, _MISSING)
+            if cached is not _MISSING:
+                return cached
+
+            # Coalesce identical concurrent calls: later callers await the
+            # first caller's future instead of issuing their own request.
+            # Check-and-insert has no await in between, so no lock is needed.
+            # Futures are loop-bound; callers on another loop (e.g. the
+            # AsyncBridge thread) fetch independently.
+            loop = asyncio.get_running_loop()
+            while (pending := _inflight.get(key)) is not None and pending.get_loop() is loop:
+                try:
+                    shared = await asyncio.shield(pending)
+                except asyncio.CancelledError:
+                    # A cancelled leader says nothing about this caller: look
+                    # again, and fetch ourselves if nobody else took over
+                    if not pending.cancelled() or _cancel_requested():
+                        raise
+                    continue
+                return copy.deepcopy(shared)
+
+            future = loop.create_future()
+            _inflight[key] = future
+            try:
+                results = await func(self, *args, **kwargs)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                future.exception()  # mark retrieved when nobody else awaits it
+                raise
+            else:
+                future.set_result(results)
+            finally:
+                if _inflight.get(key) is future:
+                    del _inflight[key]
+
+            if _is_cacheable(results):
+                cache.set(key, results, expire=ttl)
+            return results
+
+        return wrapper
+
+    return decorator
@@ -1,13 +1,18 @@
+import abc
+import asyncio
+
 try:
     import akshare as ak
 except ImportError:  # pragma: no cover - optional dependency
     ak = None
+import numpy as np
 import pandas as pd
-try:
-    import yfinance as yf
-except ImportError:  # pragma: no cover - optional dependency
-    yf = None
-from ..base import Tool, ToolResult
+from .._yfinance import yf
+from ..base import Tool, ToolResult, _require_stock_code
+from ..cache import cached_api
+
+# Statements only change with new filings; a day keeps repeat lookups local.
+STATEMENT_CACHE_TTL = 24 * 60 * 60
 
 def preprocess_balance_data(data: pd.DataFrame) -> pd.DataFrame:
     data.drop(['SECUCODE','SECURITY_CODE','SECURITY_NAME_ABBR','ORG_CODE', 'DATE_TYPE_CODE', 'FISCAL_YEAR','STD_ITEM_CODE','REPORT_DATE'], axis=1, inplace=True)
@@ -88,43 +93,43 @@ def _prepare_us_statement_df(statement: pd.DataFrame, index_name: str = "Item (U
     """Normalize yfinance statement format to the same table-like output pattern."""
     if statement is None or statement.empty:
         return None
-    data = statement.T.sort_index()
-    data = (data / 1_000_000).round(2)
-    if hasattr(data.index, "strftime"):
-        data.index = data.index.strftime("%Y")
-    data = data.T
+    # yfinance already lays statements out as items x periods, so scale the raw
+    # array and reorder the period columns without transposing the frame.
+    order = statement.columns.argsort()
+    values = statement.to_numpy(dtype=np.float64, na_value=np.nan)[:, order]
+    periods = statement.columns[order]
+    if hasattr(periods, "strftime"):
+        periods = periods.strftime("%Y")
+    data = pd.DataFrame(np.round(values / 1_000_000, 2), index=statement.index, columns=periods)
     data.index.name = index_name
     return data.reset_index()
 
-class BalanceSheet(Tool):
-    def __init__(self):
-        super().__init__(
-            name = "Balance sheet",
-            description = "Returns the balance sheet covering assets, liabilities, and shareholders' equity for a given ticker.",
-            parameters = [
-                {"name": "stock_code", "type": "str", "description": "Ticker, e.g., 000001", "required": True},
-                {"name": "market", "type": "str", "description": "Market flag: HK, A, or US", "required": True},
-                {"name": "period", "type": "str", "description": "Reporting period (defaults to annual)", "required": False},
-            ],
-        )
+class _StatementTool(Tool, metaclass=abc.ABCMeta):
+    """
+    Shared fetch path for the three financial statements.
+
+    Subclasses only declare where each market's data comes from; the HK
+    pivot, the US normalization and error handling live here.
+    """
+    HK_SYMBOL = ""        # akshare ``stock_financial_hk_report_em`` symbol
+    HK_DATE_COLUMN = ""   # period column in the HK report
+    US_ATTRIBUTE = ""     # yfinance ``Ticker`` attribute
+    PARAMS_PERIOD = "annual"
+    LABEL = ""            # used in messages, e.g. "balance sheet"
 
     def prepare_params(self, task) -> dict:
         """
         Build parameters from the routing task.
         """
-        if task.stock_code is None:
-            # Should already be populated by the router
-            assert False, "Stock code cannot be empty"
-        else:
-            return {"stock_code": task.stock_code, "market": task.market, "period": "annual"}
-    
+        return {"stock_code": _require_stock_code(task), "market": task.market, "period": self.PARAMS_PERIOD}
+
     def _preprocess_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """
-        Transform the raw balance-sheet dataframe into a cleaner pivot table.
+        Transform the raw HK statement dataframe into a cleaner pivot table.
         """
         data.drop(['SECUCODE','SECURITY_CODE','SECURITY_NAME_ABBR','ORG_CODE', 'DATE_TYPE_CODE', 'FISCAL_YEAR','STD_ITEM_CODE','REPORT_DATE'], axis=1, inplace=True)
-        data['YEAR'] = data['STD_REPORT_DATE'].apply(lambda x: pd.to_datetime(x).year)
-        data.drop(['STD_REPORT_DATE'], axis=1, inplace=True)
+        data['YEAR'] = data[self.HK_DATE_COLUMN].apply(lambda x: pd.to_datetime(x).year)
+        data.drop([self.HK_DATE_COLUMN], axis=1, inplace=True)
         pd.set_option('display.float_format', '{:.2f}'.format) 
         data['AMOUNT'] = data['AMOUNT'].apply(lambda x: float(x)//1000000)
 
@@ -156,152 +161,114 @@ class BalanceSheet(Tool):
         filtered_df['会计年度 (人民币百万)'] = filtered_df['会计年度 (人民币百万)'].apply(lambda x: f"**{x}**" if x.startswith('总') else x)
         return filtered_df
 
-        
+    @abc.abstractmethod
+    def _fetch_a_share(self, stock_code: str) -> pd.DataFrame:
+        """Fetch the A-share statement (source differs per statement)."""
 
+    @abc.abstractmethod
+    def _source(self, stock_code: str) -> str:
+        """Describe where the A-share statement came from."""
+
+    @cached_api(ttl=STATEMENT_CACHE_TTL)
     async def api_function(self, stock_code: str, market: str = "HK", period: str = "年度"):
         """
-        Fetch the balance sheet for the requested ticker.
+        Fetch the statement for the requested ticker.
         """
         period = "年度"
         try:
             market = (market or "HK").upper()
             if market == "HK":
                 if ak is None:
-                    raise ImportError("akshare is required for HK balance sheet data")
-                data = ak.stock_financial_hk_report_em(
+                    raise ImportError(f"akshare is required for HK {self.LABEL} data")
+                data = await asyncio.to_thread(
+                    ak.stock_financial_hk_report_em,
                     stock = stock_code,
-                    symbol = "资产负债表",
+                    symbol = self.HK_SYMBOL,
                     indicator = period,
                 )
                 try:
                     data = self._preprocess_data(data)
                 except Exception as e:
-                    print("Failed to preprocess balance-sheet data", e)
+                    print(f"Failed to preprocess {self.LABEL} data", e)
             elif market == "A":
                 if ak is None:
-                    raise ImportError("akshare is required for A-share balance sheet data")
-                data = ak.stock_balance_sheet_by_yearly_em(
-                    symbol = stock_code,
-                )
+                    raise ImportError(f"akshare is required for A-share {self.LABEL} data")
+                data = await asyncio.to_thread(self._fetch_a_share, stock_code)
             elif market == "US":
                 if yf is None:
-                    raise ImportError("yfinance is required for US balance sheet data")
-                data = _prepare_us_statement_df(yf.Ticker(stock_code).balance_sheet)
+                    raise ImportError(f"yfinance is required for US {self.LABEL} data")
+                statement = await asyncio.to_thread(lambda: getattr(yf.Ticker(stock_code), self.US_ATTRIBUTE))
+                data = _prepare_us_statement_df(statement)
             else:
                 raise ValueError(f"Unsupported market flag: {market}. Use 'HK', 'A', or 'US'.")
         except Exception as e:
-            print("Failed to fetch balance sheet", e)
+            print(f"Failed to fetch {self.LABEL}", e)
+            print("Parameters", stock_code, market, period)
             data = None
         return [
             ToolResult(
                 name = f"{self.name} (ticker: {stock_code})",
-                description = f"Balance sheet for ticker {stock_code}.",
+                description = f"{self.LABEL.capitalize()} for ticker {stock_code}.",
                 data = data,
-                source=f"Eastmoney financials: balance sheet for {stock_code}. https://emweb.securities.eastmoney.com/PC_HSF10/NewFinanceAnalysis/Index?type=web&code={stock_code}#lrb-0."
+                source = self._source(stock_code),
             )
         ]
 
-class IncomeStatement(Tool):
+
+class BalanceSheet(_StatementTool):
+    HK_SYMBOL = "资产负债表"
+    HK_DATE_COLUMN = "STD_REPORT_DATE"
+    US_ATTRIBUTE = "balance_sheet"
+    LABEL = "balance sheet"
+
     def __init__(self):
         super().__init__(
-            name = "Income statement",
-            description = "Returns the income statement detailing revenue, costs, expenses, and earnings for a given ticker.",
+            name = "Balance sheet",
+            description = "Returns the balance sheet covering assets, liabilities, and shareholders' equity for a given ticker.",
             parameters = [
                 {"name": "stock_code", "type": "str", "description": "Ticker, e.g., 000001", "required": True},
                 {"name": "market", "type": "str", "description": "Market flag: HK, A, or US", "required": True},
+                {"name": "period", "type": "str", "description": "Reporting period (defaults to annual)", "required": False},
             ],
         )
 
-    def prepare_params(self, task) -> dict:
-        """
-        Build parameters from the routing task.
-        """
-        if task.stock_code is None:
-            # Should already be populated by the router
-            assert False, "Stock code cannot be empty"
-        else:
-            return {"stock_code": task.stock_code, "market": task.market, "period": "annual"}
-
-    def _preprocess_data(self, data: pd.DataFrame) -> pd.DataFrame:
-        """
-        Transform the raw income-statement dataframe into a cleaner pivot table.
-        """
-        data.drop(['SECUCODE','SECURITY_CODE','SECURITY_NAME_ABBR','ORG_CODE', 'DATE_TYPE_CODE', 'FISCAL_YEAR','STD_ITEM_CODE','REPORT_DATE'], axis=1, inplace=True)
-        data['YEAR'] = data['START_DATE'].apply(lambda x: pd.to_datetime(x).year)
-        data.drop(['START_DATE'], axis=1, inplace=True)
-        pd.set_option('display.float_format', '{:.2f}'.format) 
-        data['AMOUNT'] = data['AMOUNT'].apply(lambda x: float(x)//1000000)
-
-        item_order = {item: idx for idx, item in enumerate(data['STD_ITEM_NAME'].unique())}
+    def _fetch_a_share(self, stock_code: str) -> pd.DataFrame:
+        return ak.stock_balance_sheet_by_yearly_em(symbol=stock_code)
 
-        pivot_df = data.pivot_table(
-            index='STD_ITEM_NAME',
-            columns='YEAR',
-            values='AMOUNT',
-            aggfunc='sum'
-        ).reset_index()
+    def _source(self, stock_code: str) -> str:
+        return f"Eastmoney financials: balance sheet for {stock_code}. https://emweb.securities.eastmoney.com/PC_HSF10/NewFinanceAnalysis/Index?type=web&code={stock_code}#lrb-0."
 
-        pivot_df.columns.name = None
-        pivot_df['original_order'] = pivot_df['STD_ITEM_NAME'].map(item_order)
-        pivot_df = pivot_df.sort_values('original_order').drop(columns='original_order')
 
-        year_cols = sorted([col for col in pivot_df.columns if col != 'STD_ITEM_NAME'])
-        pivot_df = pivot_df[['STD_ITEM_NAME'] + year_cols]
+class IncomeStatement(_StatementTool):
+    HK_SYMBOL = "利润表"
+    HK_DATE_COLUMN = "START_DATE"
+    US_ATTRIBUTE = "income_stmt"
+    LABEL = "income statement"
 
-        pivot_df['nan_count'] = pivot_df.iloc[:, 1:].isna().sum(axis=1)
-        filtered_df = pivot_df[pivot_df['nan_count'] <= 3].copy()
-        filtered_df.drop(columns='nan_count', inplace=True)
+    def __init__(self):
+        super().__init__(
+            name = "Income statement",
+            description = "Returns the income statement detailing revenue, costs, expenses, and earnings for a given ticker.",
+            parameters = [
+                {"name": "stock_code", "type": "str", "description": "Ticker, e.g., 000001", "required": True},
+                {"name": "market", "type": "str", "description": "Market flag: HK, A, or US", "required": True},
+            ],
+        )
 
-        filtered_df.reset_index(drop=True, inplace=True)
+    def _fetch_a_share(self, stock_code: str) -> pd.DataFrame:
+        return ak.stock_financial_benefit_ths(symbol=stock_code, indicator='按年度')
 
-        filtered_df = filtered_df.rename(columns={'STD_ITEM_NAME': '会计年度 (人民币百万)'})
-        use_columns = ['会计年度 (人民币百万)'] + [col for col in filtered_df.columns if col != '会计年度 (人民币百万)'][-5:]
-        filtered_df = filtered_df.loc[:, use_columns]
-        filtered_df['会计年度 (人民币百万)'] = filtered_df['会计年度 (人民币百万)'].apply(lambda x: f"**{x}**" if x.startswith('总') else x)
-        return filtered_df
-        
+    def _source(self, stock_code: str) -> str:
+        return f"iFinD/10jqka financials: income statement for {stock_code}. https://basic.10jqka.com.cn/new/{stock_code}/finance.html."
 
-    async def api_function(self, stock_code: str, market: str = "HK", period: str = "年度"):
-        """
-        Fetch the income statement for the requested ticker.
-        """
-        period = "年度"
-        try:
-            market = (market or "HK").upper()
-            if market == "HK":
-                if ak is None:
-                    raise ImportError("akshare is required for HK income statement data")
-                data = ak.stock_financial_hk_report_em(stock=stock_code, symbol="利润表", indicator=period)
-                try:
-                    data = self._preprocess_data(data)
-                except Exception as e:
-                    print("Failed to preprocess income-statement data", e)
-            elif market == "A":
-                if ak is None:
-                    raise ImportError("akshare is required for A-share income statement data")
-                data = ak.stock_financial_benefit_ths(symbol=stock_code, indicator='按年度')
-            elif market == "US":
-                if yf is None:
-                    raise ImportError("yfinance is required for US income statement data")
-                data = _prepare_us_statement_df(yf.Ticker(stock_code).income_stmt)
-            else:
-                raise ValueError(f"Unsupported market flag: {market}. Use 'HK', 'A', or 'US'.")
-        except Exception as e:
-            print("Failed to fetch income statement", e)
-            print("Parameters", stock_code, market, period)
-            data = None
-        
-        return [
-            ToolResult(
-                name = f"{self.name} (ticker: {stock_code})",
-                description = f"Income statement for ticker {stock_code}.",
-                data = data,
-                source=f"iFinD/10jqka financials: income statement for {stock_code}. https://basic.10jqka.com.cn/new/{stock_code}/finance.html."
-            )
-        ]
 
+class CashFlowStatement(_StatementTool):
+    HK_SYMBOL = "现金流量表"
+    HK_DATE_COLUMN = "START_DATE"
+    US_ATTRIBUTE = "cashflow"
+    PARAMS_PERIOD = "年度"
+    LABEL = "cash-flow statement"
 
-class CashFlowStatement(Tool):
     def __init__(self):
         super().__init__(
             name="Cash-flow statement",
@@ -312,88 +279,8 @@ class CashFlowStatement(Tool):
             ],
         )
 
-    def prepare_params(self, task) -> dict:
-        """
-        Build parameters from the routing task.
-        """
-        if task.stock_code is None:
-            # Should already be populated by the router
-            assert False, "Stock code cannot be empty"
-        else:
-            return {"stock_code": task.stock_code, "market": task.market, "period": "年度"}
-    def _preprocess_data(self, data: pd.DataFrame) -> pd.DataFrame:
-        """
-        Transform the raw cash-flow dataframe into a cleaner pivot table.
-        """
-        data.drop(['SECUCODE','SECURITY_CODE','SECURITY_NAME_ABBR','ORG_CODE', 'DATE_TYPE_CODE', 'FISCAL_YEAR','STD_ITEM_CODE','REPORT_DATE'], axis=1, inplace=True)
-        data['YEAR'] = data['START_DATE'].apply(lambda x: pd.to_datetime(x).year)
-        data.drop(['START_DATE'], axis=1, inplace=True)
-        pd.set_option('display.float_format', '{:.2f}'.format) 
-        data['AMOUNT'] = data['AMOUNT'].apply(lambda x: float(x)//1000000)
-
-        item_order = {item: idx for idx, item in enumerate(data['STD_ITEM_NAME'].unique())}
-
-        pivot_df = data.pivot_table(
-            index='STD_ITEM_NAME',
-            columns='YEAR',
-            values='AMOUNT',
-            aggfunc='sum'
-        ).reset_index()
-
-        pivot_df.columns.name = None
-        pivot_df['original_order'] = pivot_df['STD_ITEM_NAME'].map(item_order)
-        pivot_df = pivot_df.sort_values('original_order').drop(columns='original_order')
-
-        year_cols = sorted([col for col in pivot_df.columns if col != 'STD_ITEM_NAME'])
-        pivot_df = pivot_df[['STD_ITEM_NAME'] + year_cols]
-
-        pivot_df['nan_count'] = pivot_df.iloc[:, 1:].isna().sum(axis=1)
-        filtered_df = pivot_df[pivot_df['nan_count'] <= 3].copy()
-        filtered_df.drop(columns='nan_count', inplace=True)
-
-        filtered_df.reset_index(drop=True, inplace=True)
-
-        filtered_df = filtered_df.rename(columns={'STD_ITEM_NAME': '会计年度 (人民币百万)'})
-        use_columns = ['会计年度 (人民币百万)'] + [col for col in filtered_df.columns if col != '会计年度 (人民币百万)'][-5:]
-        filtered_df = filtered_df.loc[:, use_columns]
-        filtered_df['会计年度 (人民币百万)'] = filtered_df['会计年度 (人民币百万)'].apply(lambda x: f"**{x}**" if x.startswith('总') else x)
-        return filtered_df
-
+    def _fetch_a_share(self, stock_code: str) -> pd.DataFrame:
+        return ak.stock_financial_cash_ths(symbol=stock_code, indicator='按年度')
 
-    async def api_function(self, stock_code: str, market: str = "HK", period: str = "年度"):
-        """
-        Fetch the cash-flow statement for the requested ticker.
-        """
-        period = "年度"
-        try:
-            market = (market or "HK").upper()
-            if market == "HK":
-                if ak is None:
-                    raise ImportError("akshare is required for HK cash-flow data")
-                data = ak.stock_financial_hk_report_em(stock=stock_code, symbol="现金流量表", indicator=period)
-                try:
-                    data = self._preprocess_data(data)
-                except Exception as e:
-                    print("Failed to preprocess cash-flow data", e)
-            elif market == "A":
-                if ak is None:
-                    raise ImportError("akshare is required for A-share cash-flow data")
-                #data = ak.stock_cash_flow_sheet_by_yearly_em(symbol=stock_code)
-                data = ak.stock_financial_cash_ths(symbol=stock_code, indicator='按年度')
-            elif market == "US":
-                if yf is None:
-                    raise ImportError("yfinance is required for US cash-flow data")
-                data = _prepare_us_statement_df(yf.Ticker(stock_code).cashflow)
-            else:
-                raise ValueError(f"Unsupported market flag: {market}. Use 'HK', 'A', or 'US'.")
-        except Exception as e:
-            print("Failed to fetch cash-flow statement", e)
-            data = None
-        return [
-            ToolResult(
-                name = f"{self.name} (ticker: {stock_code})",
-                description = f"Cash-flow statement for ticker {stock_code}.",
-                data = data,
-                source=f"iFinD/10jqka financials: cash-flow statement for {stock_code}. https://basic.10jqka.com.cn/new/{stock_code}/finance.html."
-            )
-        ]
+    def _source(self, stock_code: str) -> str:
+        return f"iFinD/10jqka financials: cash-flow statement for {stock_code}. https://basic.10jqka.com.cn/new/{stock_code}/finance.html."
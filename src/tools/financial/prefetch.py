@@ -0,0 +1,42 @@
+"""Warm the tool cache for a single company before agents start.
+
+Data collectors request the same handful of endpoints (profile, valuation,
+price, holders, statements) for the research target one tool call at a time.
+``prefetch_company_data`` issues all of them concurrently up front so those
+calls are served from the ``cached_api`` disk cache, and the wall time is
+bounded by the slowest request instead of their sum.
+"""
+
+import asyncio
+
+from .company_statements import BalanceSheet, CashFlowStatement, IncomeStatement
+from .stock import ShareHoldingStructure, StockBaseInfo, StockBasicInfo, StockPrice
+
+PREFETCH_TOOLS = (
+    StockBasicInfo,
+    StockBaseInfo,
+    StockPrice,
+    ShareHoldingStructure,
+    BalanceSheet,
+    IncomeStatement,
+    CashFlowStatement,
+)
+
+
+async def prefetch_company_data(stock_code: str, market: str) -> dict:
+    """Fetch every ``PREFETCH_TOOLS`` result for one ticker concurrently.
+
+    Returns a mapping of tool name to its ``ToolResult`` list; tools that
+    raise are left out (the tools already turn fetch errors into
+    ``data=None`` results, so this only guards unexpected failures).
+    """
+    tools = [tool_class() for tool_class in PREFETCH_TOOLS]
+    results = await asyncio.gather(
+        *(tool.api_function(stock_code=stock_code, market=market) for tool in tools),
+        return_exceptions=True,
+    )
+    return {
+        tool.name: result
+        for tool, result in zip(tools, results)
+        if not isinstance(result, BaseException)
+    }
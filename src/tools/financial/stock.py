@@ -1,6 +1,23 @@
+import asyncio
+import atexit
 import datetime
+import functools
 import json
-import requests
+import time
+import weakref
+from collections import OrderedDict
+
+import aiohttp
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+    _json_loads = json.loads
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
 
 try:
     import akshare as ak
@@ -12,12 +29,175 @@ except ImportError:  # pragma: no cover - optional dependency
     ef = None
 import pandas as pd
 from bs4 import BeautifulSoup
-try:
-    import yfinance as yf
-except ImportError:  # pragma: no cover - optional dependency
-    yf = None
+from .._yfinance import OHLCV_COLUMNS, yf
+
+from ..base import Tool, ToolResult, _require_stock_code
+from ..cache import cached_api
+
+# Cache lifetimes: OHLCV data is time-sensitive, profiles/holders change slowly.
+PROFILE_CACHE_TTL = 24 * 60 * 60
+PRICE_CACHE_TTL = 15 * 60
+
+# Eastmoney HK holder fields kept in the output, mapped to their column names.
+_HK_HOLDER_COLUMNS = {
+    'HOLDER_NAME': 'holder_name',
+    'TOTAL_SHARES': 'shares',
+    'TOTAL_SHARES_RATIO': 'ownership_pct',
+    'HOLD_IDENTITY': 'ownership_type',
+    'IS_ZJ': 'is_direct',
+}
+
+_EASTMONEY_HK_HOLDER_URL = (
+    "https://datacenter.eastmoney.com/securities/api/data/v1/get"
+    "?reportName=RPT_HKF10_EQUITYCHG_HOLDER"
+    "&columns=SECURITY_CODE%2CSECUCODE%2CORG_CODE%2CNOTICE_DATE%2CREPORT_DATE%2CHOLDER_NAME"
+    "%2CTOTAL_SHARES%2CTOTAL_SHARES_RATIO%2CDIRECT_SHARES%2CSHARES_CHG_RATIO%2CSHARES_TYPE"
+    "%2CEQUITY_TYPE%2CHOLD_IDENTITY%2CIS_ZJ"
+    "&quoteColumns=&filter=(SECUCODE%3D%22{code}.HK%22)(REPORT_DATE%3D%27{date}%27)"
+    "&pageNumber=1&pageSize=&sortTypes=-1%2C-1&sortColumns=EQUITY_TYPE%2CTOTAL_SHARES"
+    "&source=F10&client=PC&v=032666133943694553"
+)
+_EASTMONEY_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Connection": "keep-alive",
+}
+
+# yfinance ``.info`` fields used by the US branches: (output key, source keys
+# tried in order until one is truthy, default when missing).
+_US_PROFILE_FIELDS = (
+    ("name", ("shortName", "longName"), ""),
+    ("sector", ("sector",), ""),
+    ("industry", ("industry",), ""),
+    ("country", ("country",), ""),
+    ("market_cap", ("marketCap",), None),
+    ("enterprise_value", ("enterpriseValue",), None),
+    ("full_time_employees", ("fullTimeEmployees",), None),
+    ("business_summary", ("longBusinessSummary",), ""),
+)
+_US_VALUATION_FIELDS = (
+    ("trailing_pe", ("trailingPE",), None),
+    ("forward_pe", ("forwardPE",), None),
+    ("price_to_book", ("priceToBook",), None),
+    ("return_on_equity", ("returnOnEquity",), None),
+    ("gross_margins", ("grossMargins",), None),
+    ("operating_margins", ("operatingMargins",), None),
+    ("profit_margins", ("profitMargins",), None),
+    ("beta", ("beta",), None),
+)
+
+# aiohttp sessions are bound to the loop they were created on; tools run on
+# both the main loop and the AsyncBridge loop, so keep one pooled session per loop.
+_http_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+
+def _get_http_session() -> aiohttp.ClientSession:
+    """Return the pooled HTTP session for the running event loop."""
+    loop = asyncio.get_running_loop()
+    session = _http_sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            # Keep connections (and their TLS sessions) to the few data hosts
+            # alive between calls and cache their DNS answers.
+            connector=aiohttp.TCPConnector(
+                limit=32,
+                limit_per_host=8,
+                ttl_dns_cache=600,
+                keepalive_timeout=60,
+            ),
+        )
+        _http_sessions[loop] = session
+    return session
+
+
+# Last day of each quarter-end month, indexed by month number
+_QUARTER_END_DAY = {3: 31, 6: 30, 9: 30, 12: 31}
+
+
+@functools.lru_cache(maxsize=4)
+def _latest_quarter_end(today: datetime.date) -> str:
+    """Return the most recent quarter-end on or before *today* as ``YYYY-MM-DD``."""
+    year, month = today.year, today.month
+    if month in _QUARTER_END_DAY and today.day >= _QUARTER_END_DAY[month]:
+        # On a quarter-end day itself
+        return f"{year}-{month:02d}-{_QUARTER_END_DAY[month]:02d}"
+    # Otherwise the end of the previous quarter; Q4 of last year before March 31
+    month = (month - 1) // 3 * 3
+    if month == 0:
+        year, month = year - 1, 12
+    return f"{year}-{month:02d}-{_QUARTER_END_DAY[month]:02d}"
+
+
+def _pick_info(info: dict, stock_code: str, fields: tuple) -> dict:
+    """Build a result dict from a yfinance ``.info`` mapping using a field table."""
+    data = {"ticker": stock_code.upper()}
+    for out_key, source_keys, default in fields:
+        value = None
+        for source_key in source_keys:
+            value = info.get(source_key)
+            if value:
+                break
+        data[out_key] = default if value is None else value
+    return data
+
 
-from ..base import Tool, ToolResult
+async def _read_hk_holder_rows(response) -> list[dict]:
+    """Return ``result.data`` rows of an Eastmoney response, projected to ``_HK_HOLDER_COLUMNS``.
+
+    With ijson the rows are streamed off the socket and the rest of the
+    document is never materialized; otherwise the whole body is parsed.
+    """
+    if ijson is not None:
+        records = ijson.items(response.content, 'result.data.item', use_float=True)
+        return [
+            {new: row[old] for old, new in _HK_HOLDER_COLUMNS.items()}
+            async for row in records
+        ]
+    output = _json_loads(await response.read())
+    return [
+        {new: row[old] for old, new in _HK_HOLDER_COLUMNS.items()}
+        for row in output["result"]["data"]
+    ]
+
+
+async def _run_blocking(fn, *args, **kwargs):
+    """Run a synchronous vendor call (akshare/efinance/yfinance) off the event loop."""
+    return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+# Per-process yfinance memo: StockBasicInfo and StockBaseInfo both read the
+# same ``.info`` dict, so fetch it once per ticker. Entries expire with the
+# profile TTL and the least recently used ticker is evicted past the bound.
+YF_INFO_CACHE_SIZE = 64
+_yf_info_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+
+async def _yf_info(stock_code: str) -> dict:
+    """Return the memoized ``yf.Ticker(stock_code).info`` dict."""
+    key = stock_code.upper()
+    entry = _yf_info_cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] < PROFILE_CACHE_TTL:
+        _yf_info_cache.move_to_end(key)
+        return entry[1]
+    info = await _run_blocking(lambda: yf.Ticker(stock_code).info or {})
+    if not info:
+        return {}
+    _yf_info_cache[key] = (time.monotonic(), info)
+    _yf_info_cache.move_to_end(key)
+    while len(_yf_info_cache) > YF_INFO_CACHE_SIZE:
+        _yf_info_cache.popitem(last=False)
+    return info
+
+
+@atexit.register
+def _close_http_sessions():
+    """Close pooled sessions whose loop is still usable at interpreter exit."""
+    for loop, session in list(_http_sessions.items()):
+        if session.closed or loop.is_closed() or loop.is_running():
+            continue
+        try:
+            loop.run_until_complete(session.close())
+        except Exception:
+            pass
 
 # TODO: Add more granular Xueqiu endpoints (differentiate SH/SZ ahead of time).
 class StockBasicInfo(Tool):
@@ -35,12 +215,9 @@ class StockBasicInfo(Tool):
         """
         Build parameters for the tool call from the routing task.
         """
-        if task.stock_code is None:
-            # This should already be validated upstream
-            assert False, "Stock code cannot be empty"
-        else:
-            return {"stock_code": task.stock_code, "market": task.market}
+        return {"stock_code": _require_stock_code(task), "market": task.market}
 
+    @cached_api(ttl=PROFILE_CACHE_TTL)
     async def api_function(self, stock_code: str, market: str = "HK"):
         """
         Call the upstream API and return the corresponding dataset.
@@ -50,29 +227,19 @@ class StockBasicInfo(Tool):
             if market == "A":
                 if ak is None:
                     raise ImportError("akshare is required for A-share profile data")
-                data = ak.stock_zyjs_ths(symbol=stock_code)
+                data = await _run_blocking(ak.stock_zyjs_ths, symbol=stock_code)
             elif market == "HK":
                 if ak is None:
                     raise ImportError("akshare is required for HK profile data")
-                data = ak.stock_hk_company_profile_em(symbol=stock_code)
+                data = await _run_blocking(ak.stock_hk_company_profile_em, symbol=stock_code)
             elif market == "US":
                 if yf is None:
                     raise ImportError("yfinance is required for US market profile data")
-                info = yf.Ticker(stock_code).info or {}
+                info = await _yf_info(stock_code)
                 if not info or info.get("regularMarketPrice") is None:
                     data = None
                 else:
-                    data = {
-                        "ticker": stock_code.upper(),
-                        "name": info.get("shortName") or info.get("longName", ""),
-                        "sector": info.get("sector", ""),
-                        "industry": info.get("industry", ""),
-                        "country": info.get("country", ""),
-                        "market_cap": info.get("marketCap"),
-                        "enterprise_value": info.get("enterpriseValue"),
-                        "full_time_employees": info.get("fullTimeEmployees"),
-                        "business_summary": info.get("longBusinessSummary", ""),
-                    }
+                    data = _pick_info(info, stock_code, _US_PROFILE_FIELDS)
             else:
                 raise ValueError(f"Unsupported market flag: {market}. Use 'HK', 'A', or 'US'.")
         except Exception as e:
@@ -103,12 +270,9 @@ class ShareHoldingStructure(Tool):
         """
         Build parameters for the tool call from the routing task.
         """
-        if task.stock_code is None:
-            # This should already be validated upstream
-            assert False, "Stock code cannot be empty"
-        else:
-            return {"stock_code": task.stock_code, "market": task.market}
+        return {"stock_code": _require_stock_code(task), "market": task.market}
 
+    @cached_api(ttl=PROFILE_CACHE_TTL)
     async def api_function(self, stock_code: str, market: str = "HK"):
         """
         Fetch the shareholder list for the given market and ticker.
@@ -118,61 +282,37 @@ class ShareHoldingStructure(Tool):
             if market == "A":
                 if ak is None:
                     raise ImportError("akshare is required for A-share shareholding data")
-                data = ak.stock_main_stock_holder(stock=stock_code)
+                data = await _run_blocking(ak.stock_main_stock_holder, stock=stock_code)
             elif market == "HK":
                 if ak is None:
                     raise ImportError("akshare is required for HK shareholding data")
                 # Scrape data from Eastmoney — use the latest quarter-end date
                 # instead of a hardcoded one so the data stays fresh.
-                today = datetime.date.today()
-                quarter_ends = [
-                    datetime.date(today.year, 3, 31),
-                    datetime.date(today.year, 6, 30),
-                    datetime.date(today.year, 9, 30),
-                    datetime.date(today.year, 12, 31),
-                ]
-                # Pick the most recent quarter-end that has already passed.
-                past_ends = [d for d in quarter_ends if d <= today]
-                if not past_ends:
-                    # Before March 31 of the current year — use last year's Q4.
-                    report_date = datetime.date(today.year - 1, 12, 31)
-                else:
-                    report_date = past_ends[-1]
-                report_date_str = report_date.strftime("%Y-%m-%d")
-
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                }
-                output = requests.get(
-                    f"https://datacenter.eastmoney.com/securities/api/data/v1/get?reportName=RPT_HKF10_EQUITYCHG_HOLDER&columns=SECURITY_CODE%2CSECUCODE%2CORG_CODE%2CNOTICE_DATE%2CREPORT_DATE%2CHOLDER_NAME%2CTOTAL_SHARES%2CTOTAL_SHARES_RATIO%2CDIRECT_SHARES%2CSHARES_CHG_RATIO%2CSHARES_TYPE%2CEQUITY_TYPE%2CHOLD_IDENTITY%2CIS_ZJ&quoteColumns=&filter=(SECUCODE%3D%22{stock_code}.HK%22)(REPORT_DATE%3D%27{report_date_str}%27)&pageNumber=1&pageSize=&sortTypes=-1%2C-1&sortColumns=EQUITY_TYPE%2CTOTAL_SHARES&source=F10&client=PC&v=032666133943694553",
-                    headers = headers,
-                )
-                try:
-                    html = output.text
-                    output = json.loads(html)
-                    data = output["result"]["data"]
-                    data = pd.DataFrame(data)
-                    data = data.rename(columns={
-                        'HOLDER_NAME': 'holder_name',
-                        'TOTAL_SHARES': 'shares',
-                        'TOTAL_SHARES_RATIO': 'ownership_pct',
-                        'DIRECT_SHARES': 'direct_shares',
-                        'HOLD_IDENTITY': 'ownership_type',
-                        'IS_ZJ': 'is_direct'
-                    })
-                    data = data.loc[:, ['holder_name', 'shares', 'ownership_pct', 'ownership_type', 'is_direct']]
-                    data['is_direct'] = data['is_direct'].map({'1': 'Yes', '0': 'No'})
-                    data.sort_values(by='ownership_pct', ascending=False, inplace=True)
-                    data.reset_index(drop=True, inplace=True)
-                except Exception as e:
-                    print("Failed to parse Hong Kong shareholding structure", e)
-                    data = None
+                report_date_str = _latest_quarter_end(datetime.date.today())
+
+                async with _get_http_session().get(
+                    _EASTMONEY_HK_HOLDER_URL.format(code=stock_code, date=report_date_str),
+                    headers = _EASTMONEY_HEADERS,
+                    timeout = aiohttp.ClientTimeout(total=15),
+                ) as response:
+                    try:
+                        rows = await _read_hk_holder_rows(response)
+                        if not rows:
+                            raise ValueError("no holder rows in response")
+                        data = pd.DataFrame.from_records(rows, columns=list(_HK_HOLDER_COLUMNS.values()))
+                        data['is_direct'] = data['is_direct'].astype('category').map({'1': 'Yes', '0': 'No'})
+                        data['ownership_pct'] = pd.to_numeric(data['ownership_pct'])
+                        data = data.sort_values(by='ownership_pct', ascending=False, ignore_index=True)
+                    except Exception as e:
+                        print("Failed to parse Hong Kong shareholding structure", e)
+                        data = None
             elif market == "US":
                 if yf is None:
                     raise ImportError("yfinance is required for US shareholding data")
                 ticker = yf.Ticker(stock_code)
-                major_holders = ticker.major_holders
-                institutional_holders = ticker.institutional_holders
+                major_holders, institutional_holders = await _run_blocking(
+                    lambda: (ticker.major_holders, ticker.institutional_holders)
+                )
                 major_data = (
                     major_holders.to_dict(orient="records")
                     if major_holders is not None and not major_holders.empty
@@ -219,6 +359,7 @@ class StockBaseInfo(Tool):
     def prepare_params(self, task) -> dict:
         return {"stock_code": task.stock_code, "market": getattr(task, "market", "HK")}
 
+    @cached_api(ttl=PROFILE_CACHE_TTL)
     async def api_function(self, stock_code: str, market: str = "HK"):
         """
         Fetch fundamental metrics for the requested ticker.
@@ -228,25 +369,15 @@ class StockBaseInfo(Tool):
             if market in ("A", "HK"):
                 if ef is None:
                     raise ImportError("efinance is required for A/HK valuation data")
-                data = ef.stock.get_base_info(stock_code)
+                data = await _run_blocking(ef.stock.get_base_info, stock_code)
             elif market == "US":
                 if yf is None:
                     raise ImportError("yfinance is required for US valuation data")
-                info = yf.Ticker(stock_code).info or {}
+                info = await _yf_info(stock_code)
                 if not info or info.get("regularMarketPrice") is None:
                     data = None
                 else:
-                    data = {
-                        "ticker": stock_code.upper(),
-                        "trailing_pe": info.get("trailingPE"),
-                        "forward_pe": info.get("forwardPE"),
-                        "price_to_book": info.get("priceToBook"),
-                        "return_on_equity": info.get("returnOnEquity"),
-                        "gross_margins": info.get("grossMargins"),
-                        "operating_margins": info.get("operatingMargins"),
-                        "profit_margins": info.get("profitMargins"),
-                        "beta": info.get("beta"),
-                    }
+                    data = _pick_info(info, stock_code, _US_VALUATION_FIELDS)
             else:
                 raise ValueError(f"Unsupported market flag: {market}. Use 'HK', 'A', or 'US'.")
         except Exception as e:
@@ -277,6 +408,7 @@ class StockPrice(Tool):
     def prepare_params(self, task) -> dict:
         return {"stock_code": task.stock_code, "market": getattr(task, "market", "HK"), "period": "1y"}
 
+    @cached_api(ttl=PRICE_CACHE_TTL)
     async def api_function(self, stock_code: str, market: str = "HK", period: str = "1y"):
         """
         Fetch historical quote data for the requested ticker.
@@ -286,17 +418,16 @@ class StockPrice(Tool):
             if market in ("A", "HK"):
                 if ef is None:
                     raise ImportError("efinance is required for A/HK price history")
-                data = ef.stock.get_quote_history(stock_code)
+                data = await _run_blocking(ef.stock.get_quote_history, stock_code)
             elif market == "US":
                 if yf is None:
                     raise ImportError("yfinance is required for US price history")
-                hist = yf.Ticker(stock_code).history(period=period)
+                hist = await _run_blocking(yf.Ticker(stock_code).history, period=period)
                 if hist is None or hist.empty:
                     data = None
                 else:
                     hist = hist.reset_index()
-                    keep_cols = [c for c in ["Date", "Open", "High", "Low", "Close", "Volume"] if c in hist.columns]
-                    data = hist[keep_cols].copy()
+                    data = hist[[c for c in OHLCV_COLUMNS if c in hist.columns]].copy()
             else:
                 raise ValueError(f"Unsupported market flag: {market}. Use 'HK', 'A', or 'US'.")
         except Exception as e:
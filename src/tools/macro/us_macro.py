@@ -9,32 +9,53 @@ is missing the tools will still instantiate but return an error ToolResult
 when called, allowing the agent to gracefully degrade.
 """
 
+import asyncio
+import datetime
+import functools
 import os
 
 import pandas as pd
 
+from .._yfinance import OHLCV_COLUMNS, PRICE_COLUMNS, yf
 from ..base import Tool, ToolResult
+from ..cache import cached_api
 
-# Lazy-loaded to avoid import-time failures
-_fred = None
+INDEX_CACHE_TTL = 15 * 60
+
+@functools.lru_cache(maxsize=1)
+def _build_fred(api_key: str):
+    """Build the ``Fred`` client for *api_key*; a failed build raises and is not cached."""
+    from fredapi import Fred
+    return Fred(api_key=api_key)
 
 
 def _get_fred():
-    """Return a cached ``Fred`` client, or ``None`` if the key is not set."""
-    global _fred
-    if _fred is not None:
-        return _fred
+    """Return the process-wide ``Fred`` client, or ``None`` if the key is not set.
+
+    Built lazily on first use to avoid import-time failures. The key is read
+    on each call so one set (or fixed) later is picked up; the client itself
+    is built once per key.
+    """
     api_key = os.environ.get("FRED_API_KEY")
     if not api_key:
         return None
     try:
-        from fredapi import Fred
-        _fred = Fred(api_key=api_key)
-        return _fred
+        return _build_fred(api_key)
     except Exception:
         return None
 
 
+@functools.lru_cache(maxsize=4)
+def _default_start(years: int, today: datetime.date) -> str:
+    """ISO date *years* before *today*; keyed on *today* so it rolls over daily."""
+    return (today - datetime.timedelta(days=365 * years)).isoformat()
+
+
+def _series_frame(series: pd.Series, column: str) -> pd.DataFrame:
+    """Two-column ``date``/*column* frame from a FRED series, without copying the values."""
+    return pd.DataFrame({"date": series.index, column: series.to_numpy()}, copy=False)
+
+
 class USCPI(Tool):
     def __init__(self):
         super().__init__(
@@ -54,10 +75,9 @@ class USCPI(Tool):
             )]
         try:
             if start is None:
-                import datetime
-                start = (datetime.date.today() - datetime.timedelta(days=365 * 10)).isoformat()
-            series = fred.get_series("CPIAUCSL", observation_start=start)
-            data = pd.DataFrame({"date": series.index, "CPI": series.values})
+                start = _default_start(10, datetime.date.today())
+            series = await asyncio.to_thread(fred.get_series, "CPIAUCSL", observation_start=start)
+            data = _series_frame(series, "CPI")
         except Exception as e:
             print(f"Failed to fetch FRED CPI: {e}")
             data = None
@@ -86,10 +106,9 @@ class USGDP(Tool):
             )]
         try:
             if start is None:
-                import datetime
-                start = (datetime.date.today() - datetime.timedelta(days=365 * 20)).isoformat()
-            series = fred.get_series("GDP", observation_start=start)
-            data = pd.DataFrame({"date": series.index, "GDP_billions": series.values})
+                start = _default_start(20, datetime.date.today())
+            series = await asyncio.to_thread(fred.get_series, "GDP", observation_start=start)
+            data = _series_frame(series, "GDP_billions")
         except Exception as e:
             print(f"Failed to fetch FRED GDP: {e}")
             data = None
@@ -118,10 +137,9 @@ class USUnemployment(Tool):
             )]
         try:
             if start is None:
-                import datetime
-                start = (datetime.date.today() - datetime.timedelta(days=365 * 10)).isoformat()
-            series = fred.get_series("UNRATE", observation_start=start)
-            data = pd.DataFrame({"date": series.index, "unemployment_rate_pct": series.values})
+                start = _default_start(10, datetime.date.today())
+            series = await asyncio.to_thread(fred.get_series, "UNRATE", observation_start=start)
+            data = _series_frame(series, "unemployment_rate_pct")
         except Exception as e:
             print(f"Failed to fetch FRED Unemployment: {e}")
             data = None
@@ -149,18 +167,17 @@ class USInterestRates(Tool):
                 data=None, source="FRED",
             )]
         try:
-            import datetime
             if start is None:
-                start = (datetime.date.today() - datetime.timedelta(days=365 * 10)).isoformat()
+                start = _default_start(10, datetime.date.today())
             series_ids = {"FEDFUNDS": "fed_funds_rate", "DGS10": "treasury_10y", "DGS2": "treasury_2y"}
-            frames = []
-            for sid, col in series_ids.items():
-                s = fred.get_series(sid, observation_start=start)
-                frames.append(pd.DataFrame({"date": s.index, col: s.values}))
-            data = frames[0]
-            for f in frames[1:]:
-                data = data.merge(f, on="date", how="outer")
-            data = data.sort_values("date").reset_index(drop=True)
+            # Fetch the three series concurrently
+            series_list = await asyncio.gather(*(
+                asyncio.to_thread(fred.get_series, sid, observation_start=start)
+                for sid in series_ids
+            ))
+            # One outer join on the shared DatetimeIndex instead of chained merges on "date"
+            data = pd.concat(dict(zip(series_ids.values(), series_list)), axis=1, join="outer")
+            data = data.sort_index().rename_axis("date").reset_index()
         except Exception as e:
             print(f"Failed to fetch FRED interest rates: {e}")
             data = None
@@ -181,20 +198,20 @@ class USMarketIndex(Tool):
             ],
         )
 
+    @cached_api(ttl=INDEX_CACHE_TTL)
     async def api_function(self, index_symbol: str = "^GSPC", period: str = "1y"):
         try:
-            import yfinance as yf
+            if yf is None:
+                raise ImportError("yfinance is required for US market index data")
             t = yf.Ticker(index_symbol)
-            hist = t.history(period=period)
+            hist = await asyncio.to_thread(t.history, period=period)
             if hist.empty:
                 data = None
             else:
                 hist = hist.reset_index()
-                keep_cols = [c for c in ["Date", "Open", "High", "Low", "Close", "Volume"] if c in hist.columns]
-                data = hist[keep_cols].copy()
-                for col in ["Open", "High", "Low", "Close"]:
-                    if col in data.columns:
-                        data[col] = data[col].round(2)
+                data = hist[[c for c in OHLCV_COLUMNS if c in hist.columns]].copy()
+                price_cols = [c for c in PRICE_COLUMNS if c in data.columns]
+                data[price_cols] = data[price_cols].round(2)
         except Exception as e:
             print(f"Failed to fetch US market index {index_symbol}: {e}")
             data = None
@@ -13,13 +13,33 @@ import asyncio
 import threading
 from typing import Any, Coroutine
 
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional dependency (no Windows support)
+    uvloop = None
+
+
+def _new_loop() -> asyncio.AbstractEventLoop:
+    """Create the bridge loop, libuv-backed when uvloop is installed.
+
+    Only the bridge's own loop is affected; the global event-loop policy (and so
+    the caller's main loop) is left alone.
+    """
+    if uvloop is not None:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
 
 class AsyncBridge:
-    """Run coroutines from synchronous code without deadlocking the main loop."""
+    """Run coroutines from synchronous code without deadlocking the main loop.
+
+    Every coroutine runs on the one bridge loop, so loop-bound objects shared
+    across agents (e.g. the AsyncOpenAI client's httpx pool) stay on one loop.
+    """
 
     def __init__(self, timeout: float = 300.0):
         self._timeout = timeout
-        self._loop = asyncio.new_event_loop()
+        self._loop = _new_loop()
         self._thread = threading.Thread(
             target=self._loop.run_forever,
             daemon=True,
@@ -1,8 +1,10 @@
 import asyncio
+import functools
 import io
 import logging
 import sys
 import os
+import threading
 import dill  # Use dill instead of pickle for more robust serialization
 import traceback
 import uuid
@@ -22,10 +24,58 @@ RESTRICTED_MODULES = frozenset({
     "webbrowser", "code", "codeop", "compileall",
 })
 
+# open() mode characters that make the call a write.
+_WRITE_MODE_CHARS = frozenset("wax+")
+
 # Default execution timeout in seconds.
 DEFAULT_EXEC_TIMEOUT = 120
 
 
+def _run_in_daemon_thread(func) -> asyncio.Future:
+    """Run *func* on a fresh daemon thread and return a future for its result.
+
+    Python threads cannot be killed, so code that exceeds its timeout keeps
+    running. Giving each execution its own daemon thread (rather than the
+    loop's default executor) means a runaway snippet neither ties up a shared
+    pool worker nor blocks interpreter shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def _resolve(result, exc):
+        if future.done():  # already cancelled by a timeout
+            return
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    def _runner():
+        result, exc = None, None
+        try:
+            result = func()
+        except BaseException as e:
+            exc = e
+        try:
+            loop.call_soon_threadsafe(_resolve, result, exc)
+        except RuntimeError:
+            pass  # loop closed while the code was still running
+
+    threading.Thread(target=_runner, name="code-executor", daemon=True).start()
+    return future
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_source(source: str) -> types.CodeType:
+    """Compile *source* for ``exec``, reusing the code object for repeated snippets.
+
+    Agents often resubmit identical code (retries, the shared plotting header),
+    so caching skips the parse on those calls. Keeps exec's default
+    ``<string>`` filename so tracebacks look the same as before.
+    """
+    return compile(source, "<string>", "exec")
+
+
 class AsyncCodeExecutor:
     """
     Lightweight Python sandbox capable of executing LLM-generated code.
@@ -69,11 +119,13 @@ class AsyncCodeExecutor:
         import os as _os_mod
         _original_open = _builtins_mod.open
         _allowed_dir = _os_mod.path.abspath(self.working_dir)
+        # Trailing separator so a sibling like "<dir>_other" doesn't match
+        _allowed_prefix = _allowed_dir.rstrip(_os_mod.sep) + _os_mod.sep
 
         def _restricted_open(file, mode="r", *args, **kwargs):
-            if any(m in mode for m in ("w", "a", "x", "+")):
+            if not _WRITE_MODE_CHARS.isdisjoint(mode):
                 abs_path = _os_mod.path.abspath(str(file))
-                if not abs_path.startswith(_allowed_dir):
+                if not abs_path.startswith(_allowed_prefix):
                     _sandbox_logger.warning(
                         "Blocked file write to '%s' (outside sandbox dir '%s')",
                         file, _allowed_dir,
@@ -340,17 +392,16 @@ class AsyncCodeExecutor:
                 # Redirect stdout/stderr
                 with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
                     # Execute code within the custom global scope
-                    exec(code, self.globals)
+                    exec(_compile_source(code), self.globals)
             except Exception:
                 # Capture exec-level exceptions
                 has_error = True
                 stderr_capture.write(traceback.format_exc())
                 print("error code: code = \n", code)
 
-        loop = asyncio.get_running_loop()
         try:
             await asyncio.wait_for(
-                loop.run_in_executor(None, sync_exec),
+                _run_in_daemon_thread(sync_exec),
                 timeout=self.exec_timeout,
             )
         except asyncio.TimeoutError:
@@ -1,8 +1,72 @@
 import asyncio
+import bisect
+import importlib.util
 import random
-from openai import OpenAI, AsyncOpenAI
+import re
+import httpx
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
 from typing import List, Dict, Optional, Union, Any
 
+
+# Agents fan out many concurrent generate() calls; keep enough warm connections
+# that bursts reuse sockets instead of paying TLS setup each time.
+_HTTP_LIMITS = httpx.Limits(max_connections=256, max_keepalive_connections=64, keepalive_expiry=30)
+# Long generations are normal, so only the connect phase gets a short timeout
+_HTTP_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Providers cap the number of inputs per embeddings request
+EMBEDDING_BATCH_SIZE = 96
+# Embedding batches in flight at once per generate_embeddings call
+EMBEDDING_MAX_CONCURRENCY = 4
+
+_CONTEXT_LIMIT_RE = re.compile(r"maximum context length is (\d+) tokens")
+_PROMPT_TOKENS_RE = re.compile(r"(\d+) in the messages|messages resulted in (\d+) tokens")
+_COMPLETION_TOKENS_RE = re.compile(r"(\d+) in the completion")
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter: 1, 2, 4, ... capped at 32s, plus up to 50%."""
+    base_delay = min(1 << attempt, 32)
+    return base_delay + random.random() * base_delay * 0.5
+
+
+def _trim_to_fit(messages: List[Dict[str, Any]], error_str: str, max_tokens: int = 0) -> bool:
+    """
+    Drop just enough of the oldest turns to fit a context-length error, in one step.
+
+    Uses the limit and prompt size reported in the provider's error message
+    ("maximum context length is N tokens ... M in the messages"). Per-message
+    sizes are estimated from content length and scaled so they sum to the
+    reported prompt size. The first message (system/task prompt) and the last
+    message are kept. Returns False when the error carries no usable counts.
+    """
+    limit_match = _CONTEXT_LIMIT_RE.search(error_str)
+    prompt_match = _PROMPT_TOKENS_RE.search(error_str)
+    if not limit_match or not prompt_match or len(messages) < 3:
+        return False
+    limit = int(limit_match.group(1))
+    prompt_tokens = int(prompt_match.group(1) or prompt_match.group(2))
+    completion_match = _COMPLETION_TOKENS_RE.search(error_str)
+    completion_tokens = int(completion_match.group(1)) if completion_match else (max_tokens or 0)
+    excess = prompt_tokens - (limit - completion_tokens)
+    if excess <= 0:
+        return False
+
+    sizes = [len(str(message.get("content") or "")) + 16 for message in messages]
+    scale = prompt_tokens / sum(sizes)
+    cumulative = []
+    total = 0.0
+    for size in sizes[1:-1]:
+        total += size * scale
+        cumulative.append(total)
+    # Smallest number of leading turns whose removal covers the excess
+    drop = min(bisect.bisect_left(cumulative, excess) + 1, len(cumulative))
+    del messages[1:1 + drop]
+    print(f"Context length exceeded by ~{excess} tokens; dropped {drop} oldest message(s).")
+    return True
+
+
 class LLM:
     def __init__(
         self,
@@ -13,19 +77,24 @@ class LLM:
     ):
         self.client = OpenAI(
             base_url=base_url,
-            api_key=api_key
+            api_key=api_key,
+            http_client=DefaultHttpxClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT, http2=_HTTP2),
         )
         self.model_name = model_name
         self.generation_params = generation_params or {}
-    
+        self._create = self.client.chat.completions.create
+
     def generate_embeddings(
-        self, input_texts: List[str],
+        self, input_texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE,
     ):
-        response = self.client.embeddings.create(
-            model=self.model_name,
-            input=input_texts
-        )
-        return [embedding_data.embedding for embedding_data in response.data]
+        embeddings = []
+        for start in range(0, len(input_texts), batch_size):
+            response = self.client.embeddings.create(
+                model=self.model_name,
+                input=input_texts[start:start + batch_size]
+            )
+            embeddings.extend(embedding_data.embedding for embedding_data in response.data)
+        return embeddings
 
 
     def generate(
@@ -34,12 +103,14 @@ class LLM:
         **params
     ) -> Union[str, Any]:
         """Generate completion from messages."""
-        if self.client is not None and hasattr(self.client, 'chat') and hasattr(self.client.chat, 'completions'):
+        call_kwargs = {**self.generation_params, **params} if params else self.generation_params
+        # Trim-and-retry loop; `messages` is shortened in place on context errors
+        while True:
             try:
-                response = self.client.chat.completions.create(
+                response = self._create(
                     model = self.model_name,
                     messages = messages,
-                    **{**self.generation_params, **params}
+                    **call_kwargs
                 )
                 
                 if hasattr(response, 'choices'):
@@ -50,21 +121,18 @@ class LLM:
             except Exception as e:
                 if "Error code: 400" in str(e):
                     # Context too long
+                    if _trim_to_fit(messages, str(e), call_kwargs.get('max_tokens', 0)):
+                        continue
                     print(f"Generation exceeded context window with {len(messages)} messages. Removing the first assistant message.")
                     print(messages)
-                    first_assistant_message_idx = None
-                    for i, message in enumerate(messages):
-                        if message["role"] == "assistant":
-                            first_assistant_message_idx = i
-                            break
+                    first_assistant_message_idx = next(
+                        (i for i, message in enumerate(messages) if message["role"] == "assistant"), None
+                    )
                     if first_assistant_message_idx is not None:
                         messages.pop(first_assistant_message_idx)
-                        return self.generate(messages, **params)
+                        continue
                 # print(messages)
                 raise Exception(f"API call failed: {str(e)}")
-                
-        else:
-            raise NotImplementedError
 
 
 class AsyncLLM:
@@ -77,19 +145,43 @@ class AsyncLLM:
     ):
         self.client = AsyncOpenAI(
             base_url=base_url,
-            api_key=api_key
+            api_key=api_key,
+            http_client=DefaultAsyncHttpxClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT, http2=_HTTP2),
         )
         self.generation_params = generation_params or {}
         self.model_name = model_name
+        self._create = self.client.chat.completions.create
+
+    async def aclose(self):
+        """Close the pooled HTTP connections."""
+        await self.client.close()
     
+    async def _embed_batch(self, batch: List[str], semaphore: asyncio.Semaphore, max_retries: int):
+        """One embeddings request, retried with backoff on rate limits and server errors."""
+        async with semaphore:
+            for attempt in range(max_retries):
+                try:
+                    return await self.client.embeddings.create(model=self.model_name, input=batch)
+                except Exception as e:
+                    # 400s (bad input) won't succeed on retry
+                    if "Error code: 400" in str(e) or attempt == max_retries - 1:
+                        raise
+                    delay = _backoff_delay(attempt)
+                    print(f"Embedding request failed: {e}. Retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries})")
+                    await asyncio.sleep(delay)
+
     async def generate_embeddings(
-        self, input_texts: List[str],
+        self, input_texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_retries: int = 5,
     ):
-        response = await self.client.embeddings.create(
-            model=self.model_name,
-            input=input_texts
-        )
-        return [embedding_data.embedding for embedding_data in response.data]
+        # At most EMBEDDING_MAX_CONCURRENCY batches in flight; gather keeps input order.
+        # The semaphore is per call because it binds to the running loop.
+        semaphore = asyncio.Semaphore(EMBEDDING_MAX_CONCURRENCY)
+        responses = await asyncio.gather(*(
+            self._embed_batch(input_texts[start:start + batch_size], semaphore, max_retries)
+            for start in range(0, len(input_texts), batch_size)
+        ))
+        return [embedding_data.embedding for response in responses for embedding_data in response.data]
 
     async def generate(
         self, 
@@ -98,18 +190,17 @@ class AsyncLLM:
         include_stop_string=True,
         **params
     ) -> Union[str, Any]:
-        if not (self.client and hasattr(self.client, 'chat') and hasattr(self.client.chat, 'completions')):
-            raise NotImplementedError("Invalid async client provided.")
-
         last_exception = None
         
         
         for attempt in range(max_retries_per_model):
+            # Re-read each attempt: a max_tokens error below updates generation_params
+            call_kwargs = {**self.generation_params, **params} if params else self.generation_params
             try:
-                response = await self.client.chat.completions.create(
+                response = await self._create(
                     model=self.model_name,
                     messages=messages,
-                    **{**self.generation_params, **params}
+                    **call_kwargs
                 )
                 if hasattr(response, 'choices') and response.choices:
                     output =  response.choices[0].message.content
@@ -133,16 +224,14 @@ class AsyncLLM:
                     if 'Invalid max_tokens value' in error_str:
                         self.generation_params['max_tokens'] = 8192
                         break
+                    if _trim_to_fit(messages, error_str, call_kwargs.get('max_tokens', 0)):
+                        continue
                     print("Context length exceeded. Removing the first assistant message to shorten the prompt.")
                     
-                    first_assistant_message_idx = -1
-                    for i, message in enumerate(messages):
-                        # drop the first user message
-                        if i == 0 :
-                            continue
-                        if message["role"] == "user":
-                            first_assistant_message_idx = i
-                            break
+                    # drop the first user message after the initial prompt
+                    first_assistant_message_idx = next(
+                        (i for i, message in enumerate(messages) if i > 0 and message["role"] == "user"), -1
+                    )
                     
                     if first_assistant_message_idx != -1:
                         messages.pop(first_assistant_message_idx)
@@ -153,9 +242,7 @@ class AsyncLLM:
                 
                 # Exponential backoff with jitter for rate-limit (429)
                 # and transient server errors (500, 502, 503, 529).
-                base_delay = min(2 ** attempt, 32)  # 1, 2, 4, 8, 16, 32
-                jitter = random.uniform(0, base_delay * 0.5)
-                delay = base_delay + jitter
+                delay = _backoff_delay(attempt)
                 print(f"Retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries_per_model})")
                 await asyncio.sleep(delay)
 
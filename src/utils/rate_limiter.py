@@ -4,16 +4,67 @@ Usage::
 
     limiter = RateLimiter({"search_engines": 1.0, "yfinance": 0.2})
     await limiter.acquire("search_engines")  # blocks until a token is available
+
+    # In a tight loop, bind the service once
+    yf_limit = limiter.for_service("yfinance")
+    await yf_limit.acquire()
+
+    # Synchronous callers claim a slot and sleep themselves
+    time.sleep(limiter.reserve("yfinance"))
 """
 
 import asyncio
 import logging
+import threading
 import time
+from dataclasses import dataclass, field
 from typing import Dict
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class _BoundLimiter:
+    """Rate-limit state for one service, shared by every caller of that service."""
+
+    service: str
+    interval: float
+    # Monotonic time at which the next call may start
+    next_allowed: float = 0.0
+    # A thread lock (held only to reserve a slot, never across an await)
+    # rather than asyncio.Lock: callers run on the main loop and on the
+    # AsyncBridge loop(s), and an asyncio.Lock is bound to a single loop.
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def reserve(self) -> float:
+        """Claim the next call slot and return how many seconds to wait for it.
+
+        Returns ``0.0`` when no wait is needed, so callers can skip the
+        ``await`` entirely; ``acquire`` is this plus the sleep.
+        """
+        interval = self.interval
+        if interval is None or interval <= 0:
+            return 0.0
+
+        # Claim the next deadline and push it back by one interval; the
+        # caller sleeps until the claimed deadline outside the lock
+        with self.lock:
+            now = time.monotonic()
+            deadline = max(now, self.next_allowed)
+            self.next_allowed = deadline + interval
+        return deadline - now
+
+    async def acquire(self) -> None:
+        """Wait until the rate limit allows a call."""
+        wait = self.reserve()
+        if wait > 0:
+            logger.debug(
+                "Rate limiter: delaying %s call by %.2fs (interval=%.2fs)",
+                self.service, wait, self.interval,
+            )
+            await asyncio.sleep(wait)
+
+
 class RateLimiter:
     """Per-service token-bucket rate limiter.
 
@@ -26,36 +77,30 @@ class RateLimiter:
 
     def __init__(self, service_intervals: Dict[str, float] | None = None):
         self._intervals: Dict[str, float] = service_intervals or {}
-        self._last_call: Dict[str, float] = {}
-        self._locks: Dict[str, asyncio.Lock] = {}
+        self._bound: Dict[str, _BoundLimiter] = {}
 
-    def _get_lock(self, service: str) -> asyncio.Lock:
-        if service not in self._locks:
-            self._locks[service] = asyncio.Lock()
-        return self._locks[service]
+    def for_service(self, service: str) -> _BoundLimiter:
+        """Return the limiter bound to *service*, for callers that hit it repeatedly."""
+        bound = self._bound.get(service)
+        if bound is None:
+            # setdefault keeps a single instance if two threads race here
+            bound = self._bound.setdefault(
+                service, _BoundLimiter(service, self._intervals.get(service))
+            )
+        return bound
+
+    def reserve(self, service: str) -> float:
+        """Claim a slot for *service* without awaiting; returns the seconds to wait."""
+        return self.for_service(service).reserve()
 
     async def acquire(self, service: str) -> None:
         """Wait until the rate limit for *service* allows a call.
 
         If *service* is not configured, returns immediately (no limit).
         """
-        interval = self._intervals.get(service)
-        if interval is None or interval <= 0:
-            return
-
-        lock = self._get_lock(service)
-        async with lock:
-            now = time.monotonic()
-            last = self._last_call.get(service, 0.0)
-            wait = interval - (now - last)
-            if wait > 0:
-                logger.debug(
-                    "Rate limiter: delaying %s call by %.2fs (interval=%.2fs)",
-                    service, wait, interval,
-                )
-                await asyncio.sleep(wait)
-            self._last_call[service] = time.monotonic()
+        await self.for_service(service).acquire()
 
     def set_interval(self, service: str, seconds: float) -> None:
         """Update or add a rate limit for *service* at runtime."""
         self._intervals[service] = seconds
+        self.for_service(service).interval = seconds
@@ -1,13 +1,83 @@
-"""Shared fixtures for the FinSight test suite."""
+"""Shared fixtures for the FinSight test suite.
 
-import asyncio
+Async tests share one session-scoped event loop, configured through
+``asyncio_default_test_loop_scope`` in pytest.ini. When uvloop is installed
+that loop is a uvloop loop.
+"""
+
+import os
+import sys
 
 import pytest
 
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional dependency
+    uvloop = None
+
+
+if uvloop is not None:
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop, matching the AsyncBridge loops."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+def _reset_tool_cache():
+    # Only touch the module if something already imported it; importing it
+    # here would pull in the whole src.tools package for every test
+    cache_mod = sys.modules.get("src.tools.cache")
+    if cache_mod is not None:
+        cache_mod._cache = None
+
+
+@pytest.fixture(autouse=True)
+def _isolated_tool_cache(tmp_path, monkeypatch):
+    """Point the ``cached_api`` disk cache at a per-test directory.
+
+    Keeps tests from reading or writing ``~/.finsight/tool_cache``, so
+    network tests really hit the network instead of a previous run's entries.
+    """
+    monkeypatch.setenv("FINSIGHT_CACHE_DIR", str(tmp_path / "tool_cache"))
+    _reset_tool_cache()
+    yield
+    _reset_tool_cache()
+
+
+_SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "src")
+
+
+def _read_source(*parts: str) -> str:
+    with open(os.path.join(_SRC_DIR, *parts)) as f:
+        return f.read()
+
+
+@pytest.fixture(scope="session")
+def stock_source():
+    """Source text of src/tools/financial/stock.py, read once per session."""
+    return _read_source("tools", "financial", "stock.py")
+
 
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create a session-scoped event loop for async tests."""
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+def shared_tickers():
+    """Build each ``yfinance.Ticker`` once per session.
+
+    Patches ``yf.Ticker`` so every tool asking for the same symbol gets the
+    same object, whose lazily fetched ``info``/statements/history are then
+    reused across tests instead of re-requested from Yahoo.
+    """
+    from src.tools._yfinance import yf
+
+    real_ticker = yf.Ticker
+    tickers = {}
+
+    def _ticker(symbol, *args, **kwargs):
+        key = str(symbol).upper()
+        if key not in tickers:
+            tickers[key] = real_ticker(symbol, *args, **kwargs)
+        return tickers[key]
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(yf, "Ticker", _ticker)
+        yield tickers
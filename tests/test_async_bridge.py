@@ -10,8 +10,8 @@ These tests prove:
 """
 
 import asyncio
-import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
@@ -39,6 +39,12 @@ async def _slow(seconds: float):
     return "done"
 
 
+@pytest.fixture(scope="session")
+def bridge():
+    """The process-wide bridge, shared by tests that don't time out or shut it down."""
+    return get_async_bridge()
+
+
 # ---------------------------------------------------------------------------
 # Unit tests
 # ---------------------------------------------------------------------------
@@ -46,40 +52,28 @@ async def _slow(seconds: float):
 class TestAsyncBridge:
     """Tests for the AsyncBridge class."""
 
-    def test_run_async_from_sync(self):
+    def test_run_async_from_sync(self, bridge):
         """Basic: call an async func from sync code via bridge."""
-        bridge = AsyncBridge(timeout=10)
-        try:
-            result = bridge.run_async(_add(3, 4))
-            assert result == 7
-        finally:
-            bridge.shutdown()
+        result = bridge.run_async(_add(3, 4))
+        assert result == 7
 
-    def test_run_async_from_inside_event_loop(self):
+    def test_run_async_from_inside_event_loop(self, bridge):
         """Critical: call bridge.run_async while an asyncio loop is running.
 
         This reproduces the original deadlock scenario.
         """
-        bridge = AsyncBridge(timeout=10)
-        try:
-            async def _inner():
-                # We are inside a running loop — asyncio.run() would deadlock.
-                result = bridge.run_async(_add(10, 20))
-                return result
+        async def _inner():
+            # We are inside a running loop — asyncio.run() would deadlock.
+            result = bridge.run_async(_add(10, 20))
+            return result
 
-            result = asyncio.run(_inner())
-            assert result == 30
-        finally:
-            bridge.shutdown()
+        result = asyncio.run(_inner())
+        assert result == 30
 
-    def test_exception_propagation(self):
+    def test_exception_propagation(self, bridge):
         """Exceptions raised inside the coroutine propagate to the caller."""
-        bridge = AsyncBridge(timeout=10)
-        try:
-            with pytest.raises(ValueError, match="intentional failure"):
-                bridge.run_async(_fail())
-        finally:
-            bridge.shutdown()
+        with pytest.raises(ValueError, match="intentional failure"):
+            bridge.run_async(_fail())
 
     def test_timeout(self):
         """Bridge raises TimeoutError when the coroutine exceeds the limit."""
@@ -90,28 +84,12 @@ class TestAsyncBridge:
         finally:
             bridge.shutdown()
 
-    def test_multiple_concurrent_calls(self):
+    def test_multiple_concurrent_calls(self, bridge):
         """Multiple threads can submit coroutines concurrently."""
-        bridge = AsyncBridge(timeout=10)
-        results = [None] * 5
-        errors = []
-
-        def _worker(idx: int):
-            try:
-                results[idx] = bridge.run_async(_add(idx, idx))
-            except Exception as exc:
-                errors.append(exc)
-
-        try:
-            threads = [threading.Thread(target=_worker, args=(i,)) for i in range(5)]
-            for t in threads:
-                t.start()
-            for t in threads:
-                t.join(timeout=10)
-            assert not errors, f"Errors in threads: {errors}"
-            assert results == [0, 2, 4, 6, 8]
-        finally:
-            bridge.shutdown()
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            futures = [pool.submit(bridge.run_async, _add(i, i)) for i in range(5)]
+            results = [f.result(timeout=10) for f in futures]
+        assert results == [0, 2, 4, 6, 8]
 
     def test_shutdown_idempotent(self):
         """Calling shutdown() twice does not raise."""
@@ -120,6 +98,18 @@ class TestAsyncBridge:
         bridge.shutdown()  # should not raise
 
 
+    def test_uvloop_used_when_available(self):
+        """The bridge loop is libuv-backed when uvloop is installed; the policy is untouched."""
+        uvloop = pytest.importorskip("uvloop")
+        policy = asyncio.get_event_loop_policy()
+        bridge = AsyncBridge(timeout=10)
+        try:
+            assert isinstance(bridge._loop, uvloop.Loop)
+            assert bridge.run_async(_add(1, 1)) == 2
+            assert asyncio.get_event_loop_policy() is policy
+        finally:
+            bridge.shutdown()
+
 class TestGetAsyncBridge:
     """Tests for the module-level singleton accessor."""
 
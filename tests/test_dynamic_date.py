@@ -15,19 +15,9 @@ class TestDynamicQuarterDate:
 
     @staticmethod
     def _compute_report_date(today: datetime.date) -> str:
-        """Reproduce the same logic used in ShareHoldingStructure.api_function."""
-        quarter_ends = [
-            datetime.date(today.year, 3, 31),
-            datetime.date(today.year, 6, 30),
-            datetime.date(today.year, 9, 30),
-            datetime.date(today.year, 12, 31),
-        ]
-        past_ends = [d for d in quarter_ends if d <= today]
-        if not past_ends:
-            report_date = datetime.date(today.year - 1, 12, 31)
-        else:
-            report_date = past_ends[-1]
-        return report_date.strftime("%Y-%m-%d")
+        """Call the helper used by ShareHoldingStructure.api_function."""
+        from src.tools.financial.stock import _latest_quarter_end
+        return _latest_quarter_end(today)
 
     def test_jan_15(self):
         """Before Q1 end — should fall back to previous year's Q4."""
@@ -69,14 +59,8 @@ class TestDynamicQuarterDate:
                 result = self._compute_report_date(d)
                 assert result != "2024-12-31", f"Got stale date for {d}"
 
-    def test_hardcoded_string_removed_from_source(self):
+    def test_hardcoded_string_removed_from_source(self, stock_source):
         """Verify the literal '2024-12-31' no longer appears in stock.py."""
-        import os
-        stock_path = os.path.join(
-            os.path.dirname(__file__), "..", "src", "tools", "financial", "stock.py"
-        )
-        with open(stock_path) as f:
-            source = f.read()
-        assert "2024-12-31" not in source, (
+        assert "2024-12-31" not in stock_source, (
             "Hardcoded date '2024-12-31' still present in stock.py"
         )
@@ -1,62 +1,174 @@
 """Tests for the exponential backoff retry logic in AsyncLLM.generate.
 
 Verifies:
-1. Retry delay increases exponentially with jitter.
-2. The retry message is printed.
-3. The import of `random` does not break existing behavior.
+1. Retry delay increases exponentially with jitter, capped at 32s.
+2. Context-length errors trim the prompt and retry.
+3. Embeddings are batched, bounded and retried.
 """
 
 import asyncio
-import random
 
 import pytest
 
 
 class TestExponentialBackoff:
-    """Test the backoff calculation matches what llm.py uses."""
-
-    def test_backoff_progression(self):
-        """Base delays should be 1, 2, 4, 8, 16, 32 (capped)."""
-        for attempt in range(6):
-            base_delay = min(2 ** attempt, 32)
-            expected = [1, 2, 4, 8, 16, 32][attempt]
-            assert base_delay == expected, f"Attempt {attempt}: got {base_delay}, expected {expected}"
-
-    def test_jitter_within_bounds(self):
-        """Jitter should be in [0, base_delay * 0.5]."""
-        random.seed(42)
-        for attempt in range(6):
-            base_delay = min(2 ** attempt, 32)
-            jitter = random.uniform(0, base_delay * 0.5)
-            assert 0 <= jitter <= base_delay * 0.5
-
-    def test_total_delay_within_bounds(self):
-        """Total delay = base + jitter should be in [base, base * 1.5]."""
-        random.seed(42)
-        for attempt in range(6):
-            base_delay = min(2 ** attempt, 32)
-            jitter = random.uniform(0, base_delay * 0.5)
-            total = base_delay + jitter
-            assert base_delay <= total <= base_delay * 1.5
-
-    def test_cap_at_32(self):
-        """After attempt 5, delay stays capped at 32."""
-        for attempt in range(5, 20):
-            base_delay = min(2 ** attempt, 32)
-            assert base_delay == 32
-
-    def test_random_import_available(self):
-        """Verify random module is importable (used in llm.py)."""
-        import random as r
-        assert hasattr(r, 'uniform')
-
-    def test_llm_source_has_exponential_backoff(self):
-        """Verify the actual llm.py source contains the backoff pattern."""
-        import os
-        llm_path = os.path.join(
-            os.path.dirname(__file__), "..", "src", "utils", "llm.py"
-        )
-        with open(llm_path) as f:
-            source = f.read()
-        assert "2 ** attempt" in source, "Exponential backoff pattern not found in llm.py"
-        assert "random.uniform" in source, "Jitter not found in llm.py"
+    """Test the retry delay computed by src.utils.llm._backoff_delay."""
+
+    @pytest.mark.parametrize("attempt,base", [
+        (0, 1), (1, 2), (2, 4), (3, 8), (4, 16), (5, 32), (6, 32), (20, 32),
+    ])
+    @pytest.mark.parametrize("rand,factor", [(0.0, 1.0), (0.999, 1.4995)], ids=["no_jitter", "max_jitter"])
+    def test_delay(self, monkeypatch, attempt, base, rand, factor):
+        """Base doubles from 1s up to a 32s cap; jitter adds at most half the base."""
+        import src.utils.llm as llm_mod
+
+        monkeypatch.setattr(llm_mod.random, "random", lambda: rand)
+        delay = llm_mod._backoff_delay(attempt)
+        assert delay == pytest.approx(base * factor)
+        assert base <= delay < base * 1.5
+
+
+class TestTrimToFit:
+    """Test the one-step context trim used on context-length 400s."""
+
+    ERROR = (
+        "Error code: 400 - This model's maximum context length is 2000 tokens. "
+        "However, you requested 3200 tokens (2700 in the messages, 500 in the completion)."
+    )
+
+    def _messages(self):
+        turns = [
+            {"role": "user" if i % 2 else "assistant", "content": "x" * 1000}
+            for i in range(10)
+        ]
+        return [{"role": "system", "content": "task"}] + turns + [{"role": "user", "content": "last"}]
+
+    def test_drops_enough_turns_in_one_step(self):
+        from src.utils.llm import _trim_to_fit
+
+        messages = self._messages()
+        assert _trim_to_fit(messages, self.ERROR)
+        assert messages[0]["content"] == "task"
+        assert messages[-1]["content"] == "last"
+        # ~1200 tokens over at ~245 tokens per turn -> five turns go
+        assert len(messages) == 7
+
+    def test_unparseable_error_leaves_messages(self):
+        from src.utils.llm import _trim_to_fit
+
+        messages = self._messages()
+        assert not _trim_to_fit(messages, "Error code: 400 - Invalid request")
+        assert len(messages) == 12
+
+
+class TestHTTPClientPool:
+    """Test the tuned connection pool handed to the OpenAI clients."""
+
+    def test_async_client_uses_tuned_limits(self, monkeypatch):
+        import src.utils.llm as llm_mod
+
+        passed = {}
+        real_client = llm_mod.DefaultAsyncHttpxClient
+
+        def recording_client(**kwargs):
+            passed.update(kwargs)
+            return real_client(**kwargs)
+
+        monkeypatch.setattr(llm_mod, "DefaultAsyncHttpxClient", recording_client)
+        llm = llm_mod.AsyncLLM(base_url="http://localhost:1/v1", api_key="test", model_name="m")
+        assert passed["limits"].max_connections == 256
+        assert passed["limits"].max_keepalive_connections == 64
+        assert passed["timeout"].connect == 10.0
+        assert passed["timeout"].read == 600.0
+        asyncio.run(llm.aclose())
+        assert llm.client.is_closed()
+
+
+class TestEmbeddingBatches:
+    """Test that embeddings are requested in size-capped batches."""
+
+    def test_async_batches_preserve_order(self):
+        from types import SimpleNamespace
+        from src.utils.llm import AsyncLLM
+
+        llm = AsyncLLM(base_url="http://localhost:1/v1", api_key="test", model_name="m")
+        batches = []
+
+        async def create(model, input):
+            batches.append(list(input))
+            await asyncio.sleep(0.01 if input[0] == "t0" else 0)
+            return SimpleNamespace(data=[SimpleNamespace(embedding=[text]) for text in input])
+
+        llm.client = SimpleNamespace(embeddings=SimpleNamespace(create=create))
+        texts = [f"t{i}" for i in range(5)]
+        result = asyncio.run(llm.generate_embeddings(texts, batch_size=2))
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert result == [[text] for text in texts]
+
+
+    def test_async_batches_bounded_and_retried(self, monkeypatch):
+        from types import SimpleNamespace
+        import src.utils.llm as llm_mod
+
+        monkeypatch.setattr(llm_mod, "_backoff_delay", lambda attempt: 0)
+        monkeypatch.setattr(llm_mod, "EMBEDDING_MAX_CONCURRENCY", 2)
+        llm = llm_mod.AsyncLLM(base_url="http://localhost:1/v1", api_key="test", model_name="m")
+        in_flight, peak, failed = 0, 0, set()
+
+        async def create(model, input):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if input[0] not in failed:  # every batch hits one 429 first
+                failed.add(input[0])
+                raise Exception("Error code: 429 - rate limited")
+            return SimpleNamespace(data=[SimpleNamespace(embedding=[text]) for text in input])
+
+        llm.client = SimpleNamespace(embeddings=SimpleNamespace(create=create))
+        texts = [f"t{i}" for i in range(10)]
+        result = asyncio.run(llm.generate_embeddings(texts, batch_size=2))
+        assert result == [[text] for text in texts]
+        assert peak == 2
+
+    def test_async_bad_request_not_retried(self):
+        from types import SimpleNamespace
+        from src.utils.llm import AsyncLLM
+
+        llm = AsyncLLM(base_url="http://localhost:1/v1", api_key="test", model_name="m")
+        calls = []
+
+        async def create(model, input):
+            calls.append(input)
+            raise Exception("Error code: 400 - input too long")
+
+        llm.client = SimpleNamespace(embeddings=SimpleNamespace(create=create))
+        with pytest.raises(Exception, match="Error code: 400"):
+            asyncio.run(llm.generate_embeddings(["a"]))
+        assert len(calls) == 1
+
+
+class TestSyncTrimLoop:
+    """Test that LLM.generate trims and retries without recursing."""
+
+    def test_pops_assistant_messages_until_success(self):
+        from types import SimpleNamespace
+        from src.utils.llm import LLM
+
+        llm = LLM(base_url="http://localhost:1/v1", api_key="test", model_name="m")
+        calls = []
+
+        def create(model, messages, **kwargs):
+            calls.append(len(messages))
+            if len(messages) > 4:
+                raise Exception("Error code: 400 - prompt too long")
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="ok"))])
+
+        llm._create = create
+        messages = [{"role": "system", "content": "s"}] + [
+            {"role": "assistant" if i % 2 else "user", "content": str(i)} for i in range(6)
+        ]
+        assert llm.generate(messages) == "ok"
+        assert calls == [7, 6, 5, 4]
+        assert [m["role"] for m in messages] == ["system", "user", "user", "user"]
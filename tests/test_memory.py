@@ -6,20 +6,16 @@ get_collect_data, and get_analysis_result without needing full LLM stack.
 We create a minimal Config that only needs working_dir.
 """
 
+import asyncio
 import os
 import tempfile
 
 import pytest
 
 # Memory has a deep import chain (Memory -> src.agents -> DeepSearchAgent
-# -> web_crawler -> crawl4ai).  Skip the entire module gracefully.
-try:
-    from src.memory.variable_memory import Memory as _Memory
-    _HAS_MEMORY = True
-except ImportError:
-    _HAS_MEMORY = False
-
-pytestmark = pytest.mark.skipif(not _HAS_MEMORY, reason="crawl4ai or other deep dependency not installed")
+# -> web_crawler -> crawl4ai).  It is imported in the fixture, so collecting
+# this module stays cheap and any missing dependency in the chain skips the
+# tests that need it.
 
 
 class _MinimalConfig:
@@ -34,11 +30,27 @@ class _MinimalConfig:
         self.llm_dict = {}
 
 
+@pytest.fixture(scope="module")
+def make_tool_result():
+    """Factory for ToolResult objects; tests override only the fields they vary."""
+    from src.tools.base import ToolResult
+
+    def _make(name="test", description="desc", data=None, source="src"):
+        return ToolResult(name=name, description=description, data=data, source=source)
+
+    return _make
+
+
 @pytest.fixture
 def mem(tmp_path):
     """Create a Memory instance with a temp directory."""
+    try:
+        from src.memory.variable_memory import Memory
+    except ImportError as e:
+        pytest.skip(f"crawl4ai or other deep dependency not installed: {e}")
+
     cfg = _MinimalConfig(tmp_path)
-    return _Memory(cfg)
+    return Memory(cfg)
 
 
 class TestMemorySaveLoad:
@@ -54,10 +66,9 @@ class TestMemorySaveLoad:
         assert mem.log == []
         assert mem.data == []
 
-    def test_round_trip_with_data(self, mem):
+    def test_round_trip_with_data(self, mem, make_tool_result):
         # Simulate adding collect data
-        from src.tools.base import ToolResult
-        tr = ToolResult(name="test", description="desc", data={"key": "val"}, source="src")
+        tr = make_tool_result(data={"key": "val"})
         mem.data.append(tr)
         mem.save()
 
@@ -67,6 +78,45 @@ class TestMemorySaveLoad:
         assert len(mem.data) == 1
         assert mem.data[0].name == "test"
 
+    def test_round_trip_with_dataframe(self, mem, make_tool_result):
+        import pandas as pd
+        df = pd.DataFrame({"holder": ["A", "B"], "pct": [1.5, 0.25]})
+        tr = make_tool_result(name="frame", data=df)
+        mem.data.append(tr)
+        mem.save()
+
+        # The live result keeps its DataFrame
+        assert mem.data[0].data is df
+        mem.data = []
+        assert mem.load() is True
+        pd.testing.assert_frame_equal(mem.data[0].data, df)
+
+    @pytest.mark.parametrize("with_label_column", [False, True], ids=["years", "item_and_years"])
+    def test_round_trip_keeps_int_column_labels(self, mem, make_tool_result, with_label_column):
+        import pandas as pd
+        # Shaped like the HK statement pivots: one int column per year
+        df = pd.DataFrame({2023: [1.0, 2.0], 2024: [3.0, 4.0]}, index=["Revenue", "Cost"])
+        if with_label_column:
+            df = df.reset_index(names="item")
+        mem.data.append(make_tool_result(name="pivot", data=df))
+        mem.save()
+        mem.data = []
+        assert mem.load() is True
+        pd.testing.assert_frame_equal(mem.data[0].data, df)
+        assert mem.data[0].data[2023].tolist() == [1.0, 2.0]
+
+    def test_unpack_returns_new_result(self, mem, make_tool_result):
+        import pandas as pd
+        from src.memory.variable_memory import _pack_result, _unpack_result
+
+        df = pd.DataFrame({"holder": ["A", "B"], "pct": [1.5, 0.25]})
+        packed = _pack_result(make_tool_result(name="frame", data=df))
+        frame = packed.data
+        unpacked = _unpack_result(packed)
+        assert unpacked is not packed
+        assert packed.data is frame
+        pd.testing.assert_frame_equal(unpacked.data, df)
+
     def test_round_trip_with_log(self, mem):
         mem.add_log(id="a1", type="tool", input_data={"q": "test"}, output_data={"r": "ok"}, error=False, note="n")
         mem.save()
@@ -79,6 +129,89 @@ class TestMemorySaveLoad:
         assert mem.load(checkpoint_name="nonexistent.pkl") is False
 
 
+class TestMemoryScheduledSave:
+    def test_without_loop_saves_synchronously(self, mem, tmp_path):
+        mem.schedule_save()
+        assert (tmp_path / "memory" / "memory.pkl").exists()
+
+    async def test_coalesces_into_one_write(self, mem, tmp_path, monkeypatch):
+        writes = []
+        original = mem._write_state
+        monkeypatch.setattr(mem, "_write_state", lambda state, name: (writes.append(name), original(state, name)))
+        for _ in range(5):
+            mem.schedule_save(delay=0.01)
+        await mem.flush_save()
+        assert len(writes) == 1
+        assert (tmp_path / "memory" / "memory.pkl").exists()
+
+    async def test_request_during_write_not_lost(self, mem, monkeypatch):
+        import threading
+        writes = []
+        release = threading.Event()
+        original = mem._write_state
+
+        def slow_write(state, name):
+            writes.append(name)
+            if len(writes) == 1:
+                release.wait(5)  # hold the first write open
+            original(state, name)
+
+        monkeypatch.setattr(mem, "_write_state", slow_write)
+        mem.schedule_save(delay=0.01)
+        while not writes:
+            await asyncio.sleep(0.01)
+        # Requested while the worker is mid-write: must not be dropped
+        mem.schedule_save(delay=0.01)
+        release.set()
+        await mem.flush_save()
+        assert len(writes) == 2
+        assert mem._save_running is False
+
+    async def test_snapshot_taken_at_write_time(self, mem):
+        mem.schedule_save(delay=0.01)
+        mem.add_log(id="late", type="tool", input_data={}, output_data={}, error=False, note="")
+        await mem.flush_save()
+        mem.log = []
+        assert mem.load() is True
+        assert [entry["id"] for entry in mem.log] == ["late"]
+
+
+class TestMemoryFinishedAgents:
+    @staticmethod
+    def _add_agent(mem, tmp_path, agent_id, finished):
+        import dill
+        from types import SimpleNamespace
+        cache_dir = tmp_path / agent_id
+        cache_dir.mkdir()
+        with open(cache_dir / "latest.pkl", "wb") as f:
+            dill.dump({"finished": finished}, f)
+        mem._agents[agent_id] = SimpleNamespace(id=agent_id, cache_dir=str(cache_dir))
+
+    def test_finished_agent_ids(self, mem, tmp_path):
+        self._add_agent(mem, tmp_path, "done", True)
+        self._add_agent(mem, tmp_path, "busy", False)
+        assert mem.finished_agent_ids() == frozenset({"done"})
+        assert mem.finished_agent_ids(["busy", "unknown"]) == frozenset()
+
+    def test_checkpoint_reloaded_only_when_rewritten(self, mem, tmp_path, monkeypatch):
+        import dill
+        self._add_agent(mem, tmp_path, "a", False)
+        assert mem.is_agent_finished("a") is False
+
+        loads = []
+        original_load = dill.load
+        monkeypatch.setattr(dill, "load", lambda f: (loads.append(1), original_load(f))[1])
+        assert mem.is_agent_finished("a") is False
+        assert loads == []
+
+        path = tmp_path / "a" / "latest.pkl"
+        with open(path, "wb") as f:
+            dill.dump({"finished": True}, f)
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+        assert mem.is_agent_finished("a") is True
+        assert loads == [1]
+
+
 class TestMemoryDependency:
     def test_add_dependency(self, mem):
         mem.add_dependency("child1", "parent1")
@@ -109,17 +242,15 @@ class TestMemoryAddLog:
 
 
 class TestMemoryGetCollectData:
-    def test_get_collect_data_returns_tool_results(self, mem):
-        from src.tools.base import ToolResult
-        tr = ToolResult(name="Stock", description="desc", data=None, source="src")
+    def test_get_collect_data_returns_tool_results(self, mem, make_tool_result):
+        tr = make_tool_result(name="Stock")
         mem.data.append(tr)
         results = mem.get_collect_data()
         assert len(results) >= 1
 
-    def test_get_collect_data_exclude_type(self, mem):
+    def test_get_collect_data_exclude_type(self, mem, make_tool_result):
         """When exclude_type is set, items of those types should be filtered."""
-        from src.tools.base import ToolResult
-        tr = ToolResult(name="Stock", description="desc", data=None, source="src")
+        tr = make_tool_result(name="Stock")
         mem.data.append(tr)
         # ToolResult doesn't have a .type for search/click, so it should
         # still appear even when excluding 'search'
@@ -4,8 +4,9 @@ These methods are static-like (depend only on input string), so we can test
 them by instantiating a minimal mock that has these methods without needing
 a full Config/Memory/LLM stack.
 
-We import the methods directly from the source file via importlib to avoid
-triggering heavy dependency chains.
+The parsing helpers live in src/agents/_parse.py, which has no heavy imports.
+We load that file directly via importlib so collecting this module does not
+pull in the package __init__ (and with it the whole agent/tool/LLM stack).
 """
 
 import importlib.util
@@ -14,27 +15,26 @@ import sys
 
 import pytest
 
-# Load base_agent module directly to avoid full src.agents init
-_AGENT_PATH = os.path.join(
-    os.path.dirname(__file__), "..", "src", "agents", "base_agent.py"
+# Load _parse.py as a standalone module without triggering src.agents.__init__
+_PARSE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "src", "agents", "_parse.py"
 )
-_spec = importlib.util.spec_from_file_location("_base_agent_direct", _AGENT_PATH)
-_mod = importlib.util.module_from_spec(_spec)
-
-# We need src.tools and src.utils available; they should already be importable
-# from pytest's PYTHONPATH. But base_agent.py imports them at module level,
-# so we just let the normal import chain work.
-sys.modules["_base_agent_direct"] = _mod
-_spec.loader.exec_module(_mod)
-
-BaseAgent = _mod.BaseAgent
+# Reuse an earlier load (repeated collection in one process) instead of re-executing
+_MOD_KEY = "_agents_parse"
+if _MOD_KEY in sys.modules:
+    _mod = sys.modules[_MOD_KEY]
+else:
+    _spec = importlib.util.spec_from_file_location(_MOD_KEY, os.path.abspath(_PARSE_PATH))
+    _mod = importlib.util.module_from_spec(_spec)
+    sys.modules[_MOD_KEY] = _mod
+    _spec.loader.exec_module(_mod)
 
 
 class _FakeAgent:
-    """Minimal wrapper to call BaseAgent's static-ish methods without init."""
+    """Minimal wrapper exposing the helpers under BaseAgent's method names."""
 
-    _parse_llm_response = BaseAgent._parse_llm_response
-    _format_execution_result = BaseAgent._format_execution_result
+    _parse_llm_response = staticmethod(_mod.parse_llm_response)
+    _format_execution_result = staticmethod(_mod.format_execution_result)
 
 
 @pytest.fixture
@@ -77,12 +77,22 @@ class TestParseLlmResponse:
         assert action == "final"
         assert "done" in content
 
+    def test_tag_pattern_precompiled(self):
+        assert _mod._TAG_RE.pattern == r"<([\w_]+)>(.*?)</\1>"
+
     def test_multiple_tags_last_wins(self, agent):
         response = "<execute>first</execute>\n<final_result>second</final_result>"
         action, content = agent._parse_llm_response(response)
         assert action == "final"
         assert "second" in content
 
+    def test_repeated_open_tag_uses_regex_semantics(self, agent):
+        """Ambiguous text skips the single-tag fast path and matches like the regex."""
+        response = "<execute>a = 1\n<execute>b = 2</execute>"
+        action, content = agent._parse_llm_response(response)
+        assert action == "code"
+        assert content == "a = 1\n<execute>b = 2"
+
     def test_custom_tag(self, agent):
         response = "<search>query text</search>"
         action, content = agent._parse_llm_response(response)
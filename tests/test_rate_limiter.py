@@ -5,69 +5,144 @@ Proves:
 2. Configured services enforce minimum intervals.
 3. Per-service isolation (service A's limit doesn't affect service B).
 4. set_interval works at runtime.
+
+Most tests run against a virtual clock (see the ``clock`` fixture), so the
+limiter's sleeps advance time instantly instead of waiting. Tests marked
+``slow`` use real time.
 """
 
 import asyncio
+import threading
 import time
+from types import SimpleNamespace
 
 import pytest
 
+import src.utils.rate_limiter as rate_limiter_mod
 from src.utils.rate_limiter import RateLimiter
 
 
+@pytest.fixture
+def clock(monkeypatch):
+    """Virtual clock: the limiter reads it for ``monotonic`` and its sleeps advance it."""
+    state = SimpleNamespace(t=1000.0)
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(seconds):
+        state.t += seconds
+        await real_sleep(0)
+
+    monkeypatch.setattr(rate_limiter_mod.time, "monotonic", lambda: state.t)
+    monkeypatch.setattr(rate_limiter_mod.asyncio, "sleep", fake_sleep)
+    state.now = lambda: state.t
+    return state
+
+
 class TestRateLimiter:
-    @pytest.mark.asyncio
-    async def test_unconfigured_service_no_delay(self):
+    async def test_unconfigured_service_no_delay(self, clock):
         """Services not in the config should return immediately."""
         limiter = RateLimiter({"other": 5.0})
-        start = time.monotonic()
+        start = clock.now()
         await limiter.acquire("unknown_service")
-        elapsed = time.monotonic() - start
-        assert elapsed < 0.1
+        assert clock.now() == start
 
-    @pytest.mark.asyncio
-    async def test_rate_limit_enforced(self):
+    async def test_rate_limit_enforced(self, clock):
         """Two rapid calls to the same service should be spaced by the interval."""
         limiter = RateLimiter({"api": 0.3})
         await limiter.acquire("api")
-        start = time.monotonic()
+        start = clock.now()
         await limiter.acquire("api")
-        elapsed = time.monotonic() - start
-        assert elapsed >= 0.25, f"Expected >=0.25s delay, got {elapsed:.3f}s"
+        assert clock.now() - start == pytest.approx(0.3)
 
-    @pytest.mark.asyncio
-    async def test_per_service_isolation(self):
+    async def test_concurrent_callers_queue(self, clock):
+        """Concurrent callers get consecutive slots one interval apart."""
+        limiter = RateLimiter({"api": 0.5})
+        start = clock.now()
+        await asyncio.gather(*(limiter.acquire("api") for _ in range(3)))
+        assert limiter.for_service("api").next_allowed - start == pytest.approx(1.5)
+
+    async def test_per_service_isolation(self, clock):
         """Rate-limiting service A should not delay service B."""
         limiter = RateLimiter({"slow": 1.0, "fast": 0.0})
         await limiter.acquire("slow")
-        start = time.monotonic()
+        start = clock.now()
         await limiter.acquire("fast")  # fast has 0 interval
-        elapsed = time.monotonic() - start
-        assert elapsed < 0.1
+        assert clock.now() == start
 
-    @pytest.mark.asyncio
-    async def test_set_interval_runtime(self):
+    async def test_set_interval_runtime(self, clock):
         """set_interval should update rate limits at runtime."""
         limiter = RateLimiter({})
         # Initially no limit
-        start = time.monotonic()
+        start = clock.now()
         await limiter.acquire("svc")
         await limiter.acquire("svc")
-        assert time.monotonic() - start < 0.1
+        assert clock.now() == start
 
         # Now set a limit
         limiter.set_interval("svc", 0.3)
         await limiter.acquire("svc")
-        start = time.monotonic()
+        start = clock.now()
         await limiter.acquire("svc")
-        elapsed = time.monotonic() - start
-        assert elapsed >= 0.25
+        assert clock.now() - start == pytest.approx(0.3)
 
-    @pytest.mark.asyncio
-    async def test_empty_config(self):
+    async def test_empty_config(self, clock):
         """RateLimiter with no config should not block anything."""
         limiter = RateLimiter()
-        start = time.monotonic()
+        start = clock.now()
         for _ in range(10):
             await limiter.acquire("anything")
-        assert time.monotonic() - start < 0.1
+        assert clock.now() == start
+
+    async def test_bound_limiter_shares_state(self, clock):
+        """for_service returns one bound limiter that shares slots with acquire()."""
+        limiter = RateLimiter({"api": 0.3})
+        bound = limiter.for_service("api")
+        assert limiter.for_service("api") is bound
+        await bound.acquire()
+        start = clock.now()
+        await limiter.acquire("api")
+        assert clock.now() - start == pytest.approx(0.3)
+
+    def test_reserve_returns_wait_without_awaiting(self, clock):
+        """reserve() claims slots synchronously and reports the wait for each."""
+        limiter = RateLimiter({"api": 0.3, "free": 0.0})
+        assert limiter.reserve("api") == 0.0
+        assert limiter.reserve("api") == pytest.approx(0.3)
+        assert limiter.reserve("api") == pytest.approx(0.6)
+        assert limiter.reserve("free") == 0.0
+        assert limiter.reserve("unknown") == 0.0
+
+    @pytest.mark.slow
+    async def test_rate_limit_enforced_real_time(self):
+        """Same as test_rate_limit_enforced, against the real clock and sleep."""
+        limiter = RateLimiter({"api": 0.3})
+        await limiter.acquire("api")
+        start = time.monotonic()
+        await limiter.acquire("api")
+        elapsed = time.monotonic() - start
+        assert elapsed >= 0.25, f"Expected >=0.25s delay, got {elapsed:.3f}s"
+
+    @pytest.mark.slow
+    def test_shared_across_event_loops(self):
+        """One limiter can be awaited concurrently from several loops (main + bridge)."""
+        from src.utils.async_bridge import AsyncBridge
+
+        limiter = RateLimiter({"api": 0.2})
+        bridge = AsyncBridge(timeout=10)
+        try:
+            start = time.monotonic()
+            # The bridge loop, a thread's private loop and this thread's loop
+            # all contend for the same service
+            threads = [
+                threading.Thread(target=bridge.run_async, args=(limiter.acquire("api"),)),
+                threading.Thread(target=asyncio.run, args=(limiter.acquire("api"),)),
+            ]
+            for t in threads:
+                t.start()
+            asyncio.run(limiter.acquire("api"))
+            for t in threads:
+                t.join(timeout=5)
+            elapsed = time.monotonic() - start
+            assert elapsed >= 0.35, f"Expected three calls spaced by 0.2s, got {elapsed:.3f}s"
+        finally:
+            bridge.shutdown()
@@ -1,7 +1,7 @@
 """Tests for code executor sandbox hardening.
 
 Proves:
-1. Restricted module imports (subprocess, shutil, ctypes) are blocked.
+1. Restricted module imports (subprocess, shutil, ctypes, ...) are blocked.
 2. File writes outside working_dir are blocked.
 3. Execution timeout is enforced.
 4. Normal code execution still works.
@@ -10,56 +10,73 @@ Proves:
 import asyncio
 import os
 import tempfile
+import threading
 
 import pytest
 
 from src.utils.code_executor_async import AsyncCodeExecutor
 
 
-@pytest.fixture
-def executor(tmp_path):
-    return AsyncCodeExecutor(working_dir=str(tmp_path))
+@pytest.fixture(scope="session")
+def executor(tmp_path_factory):
+    """One executor for the whole session; the tests don't depend on fresh globals."""
+    return AsyncCodeExecutor(working_dir=str(tmp_path_factory.mktemp("sandbox")))
 
 
-class TestRestrictedImports:
-    @pytest.mark.asyncio
-    async def test_subprocess_blocked(self, executor):
-        result = await executor.execute("import subprocess")
-        assert result["error"] is True
-        assert "not allowed" in result["stderr"]
+@pytest.fixture
+def work_subdir(executor, request):
+    """A clean per-test directory inside the shared executor's working_dir."""
+    path = os.path.join(executor.working_dir, request.node.name)
+    os.makedirs(path)
+    return path
 
-    @pytest.mark.asyncio
-    async def test_shutil_blocked(self, executor):
-        result = await executor.execute("import shutil")
-        assert result["error"] is True
-        assert "not allowed" in result["stderr"]
 
-    @pytest.mark.asyncio
-    async def test_ctypes_blocked(self, executor):
-        result = await executor.execute("import ctypes")
+class TestRestrictedImports:
+    @pytest.mark.parametrize("mod", ["subprocess", "shutil", "ctypes", "socket", "multiprocessing"])
+    async def test_blocked_import(self, executor, mod):
+        result = await executor.execute(f"import {mod}")
         assert result["error"] is True
         assert "not allowed" in result["stderr"]
 
-    @pytest.mark.asyncio
     async def test_allowed_imports_work(self, executor):
         result = await executor.execute("import json; print(json.dumps({'a': 1}))")
         assert result["error"] is False
         assert '{"a": 1}' in result["stdout"]
 
 
+class TestCompileCache:
+    async def test_repeated_code_compiled_once(self, executor):
+        from src.utils.code_executor_async import _compile_source
+
+        _compile_source.cache_clear()
+        for _ in range(3):
+            result = await executor.execute("print('cached')")
+            assert result["error"] is False
+            assert "cached" in result["stdout"]
+        info = _compile_source.cache_info()
+        assert info.misses == 1 and info.hits == 2
+
+    async def test_syntax_error_reported(self, executor):
+        result = await executor.execute("def broken(:")
+        assert result["error"] is True
+        assert "SyntaxError" in result["stderr"]
+
+
 class TestFilesystemRestriction:
-    @pytest.mark.asyncio
-    async def test_write_inside_working_dir_allowed(self, executor, tmp_path):
-        code = f"""
-with open("{tmp_path / 'test.txt'}", "w") as f:
+    async def test_write_inside_working_dir_allowed(self, executor, work_subdir):
+        target = os.path.join(work_subdir, "test.txt")
+        # Bind the path as a global so the snippet source stays constant
+        executor.set_variable("TARGET", target)
+        code = """
+with open(TARGET, "w") as f:
     f.write("hello")
 print("wrote OK")
 """
         result = await executor.execute(code)
         assert result["error"] is False
-        assert (tmp_path / "test.txt").read_text() == "hello"
+        with open(target) as f:
+            assert f.read() == "hello"
 
-    @pytest.mark.asyncio
     async def test_write_outside_working_dir_blocked(self, executor):
         code = """
 with open("/tmp/should_not_write.txt", "w") as f:
@@ -69,32 +86,51 @@ with open("/tmp/should_not_write.txt", "w") as f:
         assert result["error"] is True
         assert "not allowed" in result["stderr"] or "PermissionError" in result["stderr"]
 
-    @pytest.mark.asyncio
-    async def test_read_anywhere_allowed(self, executor):
-        """Reading files outside working_dir should still work."""
-        # Read a file that definitely exists
-        code = """
-with open("/dev/null", "r") as f:
-    content = f.read()
-print("read OK")
-"""
-        result = await executor.execute(code)
+    async def test_write_to_sibling_prefix_dir_blocked(self, executor):
+        """A directory that merely shares working_dir's name prefix is outside it."""
+        sibling = executor.working_dir.rstrip(os.sep) + "_sibling"
+        os.makedirs(sibling, exist_ok=True)
+        target = os.path.join(sibling, "escape.txt")
+        executor.set_variable("TARGET", target)
+        result = await executor.execute("open(TARGET, 'w').close()")
+        assert result["error"] is True
+        assert "not allowed" in result["stderr"]
+        assert not os.path.exists(target)
+
+    @pytest.mark.parametrize(
+        "probe",
+        [
+            "open('/dev/null', 'r').close()",
+            "os.stat('/dev/null')",
+            "os.close(os.open('/dev/null', os.O_RDONLY))",
+        ],
+        ids=["builtin_open", "stat", "os_open"],
+    )
+    async def test_read_anywhere_allowed(self, executor, probe):
+        """Read access outside working_dir should still work."""
+        # Only the read-mode check is exercised; nothing is actually read
+        result = await executor.execute(f"import os; {probe}; print('read OK')")
         assert result["error"] is False
+        assert "read OK" in result["stdout"]
 
 
 class TestExecutionTimeout:
-    @pytest.mark.asyncio
+    # Keep the slow timeout test on its own worker under
+    # ``pytest -n auto --dist loadgroup`` so the rest of the file runs alongside it
+    @pytest.mark.xdist_group("slow_timeout")
     async def test_timeout_kills_execution(self, tmp_path):
         executor = AsyncCodeExecutor(working_dir=str(tmp_path), exec_timeout=1.0)
         code = """
 import time
 time.sleep(30)
 """
-        result = await executor.execute(code)
+        # The outer bound fails the test if the executor's own timeout doesn't fire
+        result = await asyncio.wait_for(executor.execute(code), timeout=3.0)
         assert result["error"] is True
         assert "Timeout" in result["stderr"] or "timeout" in result["stderr"].lower()
+        # The runaway code is left on a daemon thread, so it can't hold up shutdown
+        assert all(t.daemon for t in threading.enumerate() if t.name == "code-executor")
 
-    @pytest.mark.asyncio
     async def test_fast_code_within_timeout(self, executor):
         result = await executor.execute("print('fast')")
         assert result["error"] is False
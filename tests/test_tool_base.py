@@ -14,9 +14,15 @@ import pytest
 
 # Load base.py as a standalone module without triggering src.tools.__init__
 _base_path = os.path.join(os.path.dirname(__file__), "..", "src", "tools", "base.py")
-_spec = importlib.util.spec_from_file_location("_tools_base", os.path.abspath(_base_path))
-_base = importlib.util.module_from_spec(_spec)
-_spec.loader.exec_module(_base)
+# Reuse an earlier load (repeated collection in one process) instead of re-executing
+_MOD_KEY = "_tools_base"
+if _MOD_KEY in sys.modules:
+    _base = sys.modules[_MOD_KEY]
+else:
+    _spec = importlib.util.spec_from_file_location(_MOD_KEY, os.path.abspath(_base_path))
+    _base = importlib.util.module_from_spec(_spec)
+    sys.modules[_MOD_KEY] = _base
+    _spec.loader.exec_module(_base)
 Tool = _base.Tool
 ToolResult = _base.ToolResult
 
@@ -25,6 +31,17 @@ ToolResult = _base.ToolResult
 # ToolResult tests
 # ---------------------------------------------------------------------------
 
+# ToolResult never mutates its data, so the frames are shared per class
+@pytest.fixture(scope="class")
+def small_df():
+    return pd.DataFrame({"a": [1, 2], "b": [3, 4]})
+
+
+@pytest.fixture(scope="class")
+def range_df():
+    return pd.DataFrame({"col": range(20)})
+
+
 class TestToolResult:
     """Verify ToolResult data handling and string representations."""
 
@@ -45,9 +62,8 @@ class TestToolResult:
         r = ToolResult("test", "desc", [1, 2, 3])
         assert r.data == [1, 2, 3]
 
-    def test_dataframe_str(self):
-        df = pd.DataFrame({"a": [1, 2], "b": [3, 4]})
-        r = ToolResult("test", "desc", df)
+    def test_dataframe_str(self, small_df):
+        r = ToolResult("test", "desc", small_df)
         s = str(r)
         assert "First five rows:" in s
 
@@ -62,17 +78,25 @@ class TestToolResult:
         assert r1 == r2
         assert hash(r1) == hash(r2)
 
+    def test_hash_follows_renamed_name(self):
+        """Callers rename results after construction; hash must track eq."""
+        r1 = ToolResult("old", "desc", 1)
+        r2 = ToolResult("new", "desc", 1)
+        r1.name = "new"
+        assert r1 == r2
+        assert hash(r1) == hash(r2)
+
     def test_not_equal(self):
         r1 = ToolResult("name1", "desc", 1)
         r2 = ToolResult("name2", "desc", 1)
         assert r1 != r2
 
-    def test_get_full_string_df(self):
-        df = pd.DataFrame({"col": range(20)})
-        r = ToolResult("test", "desc", df)
+    def test_get_full_string_df(self, range_df):
+        r = ToolResult("test", "desc", range_df)
+        assert r.data.iloc[-1, 0] == 19
+        # to_string() for 20 rows includes all rows, so the last line is row 19
         full = r.get_full_string()
-        # to_string() for 20 rows includes all rows
-        assert "19" in full
+        assert full.splitlines()[-1].strip().endswith("19")
 
     def test_get_full_string_non_df(self):
         r = ToolResult("test", "desc", "hello world")
@@ -107,7 +131,13 @@ class TestToolBase:
         t = Tool("t", "d", [])
         assert t.prepare_params(None) == {}
 
-    @pytest.mark.asyncio
+    def test_require_stock_code(self):
+        from types import SimpleNamespace
+
+        assert _base._require_stock_code(SimpleNamespace(stock_code="AAPL")) == "AAPL"
+        with pytest.raises(ValueError):
+            _base._require_stock_code(SimpleNamespace(stock_code=None))
+
     async def test_api_function_not_implemented(self):
         t = Tool("t", "d", [])
         with pytest.raises(NotImplementedError):
@@ -0,0 +1,145 @@
+"""Tests for src.tools.cache — on-disk TTL cache for tool API responses.
+
+Proves:
+1. Repeated calls with the same arguments hit the cache.
+2. Different arguments produce different cache entries.
+3. Expired entries are refetched.
+4. Failed fetches (data=None) are not cached.
+5. Concurrent identical calls share a single in-flight fetch.
+6. Coalesced callers get independent copies and survive a cancelled leader.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import src.tools.cache as cache_mod
+from src.tools.base import Tool, ToolResult
+from src.tools.cache import DiskCache, cached_api
+
+
+class _CountingTool(Tool):
+    def __init__(self):
+        super().__init__(name="Counting tool", description="counts calls", parameters=[])
+        self.calls = 0
+
+    @cached_api(ttl=60)
+    async def api_function(self, stock_code: str, market: str = "HK"):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        data = None if stock_code == "BAD" else {"code": stock_code, "market": market}
+        return [ToolResult(name=self.name, description=self.short_description, data=data)]
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("FINSIGHT_CACHE_DIR", str(tmp_path / "tool_cache"))
+    monkeypatch.delenv("FINSIGHT_TOOL_CACHE", raising=False)
+    cache_mod._cache = None
+    yield
+    cache_mod._cache = None
+
+
+class TestDiskCache:
+    def test_set_and_get(self, tmp_path):
+        cache = DiskCache(str(tmp_path))
+        assert cache.set("k", {"a": 1}, expire=60)
+        assert cache.get("k") == {"a": 1}
+
+    def test_missing_key_returns_default(self, tmp_path):
+        cache = DiskCache(str(tmp_path))
+        assert cache.get("nope", "default") == "default"
+
+    def test_expired_entry(self, tmp_path):
+        cache = DiskCache(str(tmp_path))
+        cache.set("k", 1, expire=0.01)
+        time.sleep(0.05)
+        assert cache.get("k") is None
+
+    def test_clear_removes_only_entries(self, tmp_path):
+        cache = DiskCache(str(tmp_path))
+        cache.set("k", 1, expire=60)
+        (tmp_path / "keep.txt").write_text("x")
+        (tmp_path / "dir.pkl").mkdir()
+        cache.clear()
+        assert cache.get("k") is None
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["dir.pkl", "keep.txt"]
+
+
+class TestCachedApi:
+    async def test_repeated_call_hits_cache(self):
+        tool = _CountingTool()
+        first = await tool.api_function(stock_code="AAPL", market="US")
+        second = await tool.api_function(stock_code="AAPL", market="US")
+        assert tool.calls == 1
+        assert second[0].data == first[0].data
+
+    async def test_default_and_explicit_args_share_entry(self):
+        tool = _CountingTool()
+        await tool.api_function("00020")
+        await tool.api_function(stock_code="00020", market="HK")
+        assert tool.calls == 1
+
+    async def test_different_args_miss(self):
+        tool = _CountingTool()
+        await tool.api_function(stock_code="AAPL", market="US")
+        await tool.api_function(stock_code="MSFT", market="US")
+        assert tool.calls == 2
+
+    async def test_failed_fetch_not_cached(self):
+        tool = _CountingTool()
+        await tool.api_function(stock_code="BAD", market="US")
+        await tool.api_function(stock_code="BAD", market="US")
+        assert tool.calls == 2
+
+    async def test_disabled_by_env(self, monkeypatch):
+        monkeypatch.setenv("FINSIGHT_TOOL_CACHE", "0")
+        tool = _CountingTool()
+        await tool.api_function(stock_code="AAPL", market="US")
+        await tool.api_function(stock_code="AAPL", market="US")
+        assert tool.calls == 2
+
+
+class TestInflightCoalescing:
+    async def test_concurrent_identical_calls_fetch_once(self):
+        tool = _CountingTool()
+        results = await asyncio.gather(*[
+            tool.api_function(stock_code="AAPL", market="US") for _ in range(5)
+        ])
+        assert tool.calls == 1
+        assert all(r[0].data == {"code": "AAPL", "market": "US"} for r in results)
+
+    async def test_concurrent_failed_calls_share_result(self):
+        tool = _CountingTool()
+        results = await asyncio.gather(*[
+            tool.api_function(stock_code="BAD", market="US") for _ in range(3)
+        ])
+        assert tool.calls == 1
+        assert all(r[0].data is None for r in results)
+        assert cache_mod._inflight == {}
+
+    async def test_followers_get_independent_copies(self):
+        tool = _CountingTool()
+        leader, follower = await asyncio.gather(
+            tool.api_function(stock_code="AAPL", market="US"),
+            tool.api_function(stock_code="AAPL", market="US"),
+        )
+        assert tool.calls == 1
+        assert follower[0] is not leader[0]
+        follower[0].data["code"] = "MUTATED"
+        assert leader[0].data["code"] == "AAPL"
+
+    async def test_cancelled_leader_does_not_fail_followers(self):
+        tool = _CountingTool()
+        leader = asyncio.ensure_future(tool.api_function(stock_code="AAPL", market="US"))
+        await asyncio.sleep(0)  # leader registers its in-flight future
+        follower = asyncio.ensure_future(tool.api_function(stock_code="AAPL", market="US"))
+        await asyncio.sleep(0)  # follower starts waiting on it
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        result = await follower
+        assert result[0].data == {"code": "AAPL", "market": "US"}
+        assert tool.calls == 2
+        assert cache_mod._inflight == {}
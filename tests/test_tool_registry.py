@@ -3,12 +3,18 @@
 import pytest
 
 
+@pytest.fixture(scope="session")
+def registry_snapshot():
+    """Registered tool names and categories, read once for the read-only tests."""
+    from src.tools import get_tool_categories, list_tools
+    return {"tools": list_tools(), "cats": get_tool_categories()}
+
+
 class TestToolRegistry:
     """Verify the auto-registration picks up all tools."""
 
-    def test_core_financial_tools_registered(self):
-        from src.tools import list_tools
-        tools = list_tools()
+    def test_core_financial_tools_registered(self, registry_snapshot):
+        tools = registry_snapshot["tools"]
         expected = [
             "Stock profile",
             "Stock candlestick data",
@@ -20,9 +26,8 @@ class TestToolRegistry:
         for name in expected:
             assert name in tools, f"Financial tool '{name}' not found in registry"
 
-    def test_no_dedicated_us_tool_classes(self):
-        from src.tools import list_tools
-        tools = list_tools()
+    def test_no_dedicated_us_tool_classes(self, registry_snapshot):
+        tools = registry_snapshot["tools"]
         unexpected = [
             "US Stock profile",
             "US Stock price history",
@@ -34,32 +39,40 @@ class TestToolRegistry:
         for name in unexpected:
             assert name not in tools, f"Unexpected dedicated US tool '{name}' still registered"
 
-    def test_chinese_tools_still_registered(self):
-        """Chinese tools are registered when akshare is available."""
-        try:
-            import akshare  # noqa: F401
-        except ImportError:
-            pytest.skip("akshare not installed — Chinese tools cannot be loaded")
-
-        from src.tools import list_tools
-        tools = list_tools()
-        cn_expected = [
-            "Stock profile",
-            "Balance sheet",
-            "Income statement",
-            "Cash-flow statement",
-        ]
-        for name in cn_expected:
-            assert name in tools, f"Chinese tool '{name}' not found in registry"
-
     def test_get_tool_by_name(self):
         from src.tools import get_tool_by_name
         from src.tools.financial.stock import StockBasicInfo
         cls = get_tool_by_name("Stock profile")
         assert cls is StockBasicInfo
 
-    def test_categories_include_financial(self):
-        from src.tools import get_tool_categories
-        cats = get_tool_categories()
+    def test_categories_include_financial(self, registry_snapshot):
+        cats = registry_snapshot["cats"]
         assert "financial" in cats
         assert "Stock profile" in cats["financial"]
+
+    def test_reregistration_is_idempotent(self):
+        from src.tools import _auto_register_tools, get_tool_categories, list_tools
+        before_tools = list_tools()
+        before_cats = get_tool_categories()
+        _auto_register_tools()
+        assert list_tools() == before_tools
+        assert get_tool_categories() == before_cats
+        for names in get_tool_categories().values():
+            assert len(names) == len(set(names))
+
+    def test_shared_bases_not_registered(self):
+        from src.tools import get_avail_tools
+        from src.tools.financial.company_statements import BalanceSheet, _StatementTool
+        classes = set(get_avail_tools().values())
+        assert BalanceSheet in classes
+        assert _StatementTool not in classes
+
+    def test_statement_subclass_must_define_hooks(self):
+        from src.tools.financial.company_statements import _StatementTool
+
+        class Incomplete(_StatementTool):
+            def _source(self, stock_code):
+                return ""
+
+        with pytest.raises(TypeError, match="_fetch_a_share"):
+            Incomplete(name="x", description="x", parameters=[])
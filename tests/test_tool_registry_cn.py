@@ -0,0 +1,24 @@
+"""Tests for registration of the akshare-backed (A-share / HK) tools.
+
+Kept apart from test_tool_registry.py so the whole module is skipped at
+collection when akshare is not installed.
+"""
+
+import pytest
+
+akshare = pytest.importorskip("akshare", reason="akshare not installed — Chinese tools cannot be loaded")
+
+
+class TestChineseToolRegistry:
+    def test_chinese_tools_still_registered(self):
+        """Chinese tools are registered when akshare is available."""
+        from src.tools import list_tools
+        tools = list_tools()
+        cn_expected = [
+            "Stock profile",
+            "Balance sheet",
+            "Income statement",
+            "Cash-flow statement",
+        ]
+        for name in cn_expected:
+            assert name in tools, f"Chinese tool '{name}' not found in registry"
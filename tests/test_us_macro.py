@@ -75,45 +75,100 @@ class TestUSMacroMetadata:
 # FRED tools (graceful degradation without API key)
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(scope="class")
+def unset_fred_key():
+    # Same state for every test in the class, so set it up once
+    with pytest.MonkeyPatch.context() as mp:
+        mp.delenv("FRED_API_KEY", raising=False)
+        # Reset the cached Fred client
+        import src.tools.macro.us_macro as mod
+        mod._build_fred.cache_clear()
+        yield
+
+
+@pytest.mark.usefixtures("unset_fred_key")
 class TestFREDWithoutKey:
     """When FRED_API_KEY is not set, all FRED tools should return data=None."""
 
-    @pytest.fixture(autouse=True)
-    def _unset_fred_key(self, monkeypatch):
-        monkeypatch.delenv("FRED_API_KEY", raising=False)
-        # Reset the cached _fred client
-        import src.tools.macro.us_macro as mod
-        mod._fred = None
-
-    @pytest.mark.asyncio
     async def test_cpi_no_key(self, cpi):
         results = await cpi.api_function()
         assert len(results) == 1
         assert isinstance(results[0], ToolResult)
         assert results[0].data is None
 
-    @pytest.mark.asyncio
     async def test_gdp_no_key(self, gdp):
         results = await gdp.api_function()
         assert results[0].data is None
 
-    @pytest.mark.asyncio
     async def test_unemployment_no_key(self, unemployment):
         results = await unemployment.api_function()
         assert results[0].data is None
 
-    @pytest.mark.asyncio
     async def test_interest_no_key(self, interest):
         results = await interest.api_function()
         assert results[0].data is None
 
 
+class TestFREDOffloaded:
+    """FRED calls run in worker threads; interest-rate series are fetched together."""
+
+    async def test_interest_rates_merged(self, interest, monkeypatch):
+        import threading
+        import src.tools.macro.us_macro as mod
+
+        threads = set()
+
+        class _FakeFred:
+            def get_series(self, sid, observation_start=None):
+                threads.add(threading.get_ident())
+                idx = pd.to_datetime(["2024-01-01", "2024-02-01"])
+                return pd.Series([1.0, 2.0], index=idx, name=sid)
+
+        monkeypatch.setattr(mod, "_get_fred", lambda: _FakeFred())
+        results = await interest.api_function(start="2024-01-01")
+        data = results[0].data
+        assert list(data.columns) == ["date", "fed_funds_rate", "treasury_10y", "treasury_2y"]
+        assert len(data) == 2
+        assert threading.get_ident() not in threads
+
+    def test_client_built_once_key_is_set(self, monkeypatch):
+        import sys
+        import types
+        import src.tools.macro.us_macro as mod
+
+        built = []
+
+        class _FakeFred:
+            def __init__(self, api_key):
+                built.append(api_key)
+
+        monkeypatch.setitem(sys.modules, "fredapi", types.SimpleNamespace(Fred=_FakeFred))
+        mod._build_fred.cache_clear()
+        monkeypatch.delenv("FRED_API_KEY", raising=False)
+        assert mod._get_fred() is None
+        # A key set later in the process is picked up, then the client is reused
+        monkeypatch.setenv("FRED_API_KEY", "k1")
+        client = mod._get_fred()
+        assert isinstance(client, _FakeFred)
+        assert mod._get_fred() is client
+        assert built == ["k1"]
+        mod._build_fred.cache_clear()
+
+    def test_default_start_rolls_with_today(self):
+        import datetime
+        from src.tools.macro.us_macro import _default_start
+
+        assert _default_start(10, datetime.date(2024, 6, 30)) == "2014-07-03"
+        assert _default_start(10, datetime.date(2024, 7, 1)) == "2014-07-04"
+
+
 # ---------------------------------------------------------------------------
 # Market index (live Yahoo Finance)
 # ---------------------------------------------------------------------------
 
+@pytest.mark.integration
+@pytest.mark.usefixtures("shared_tickers")
 class TestUSMarketIndex:
-    @pytest.mark.asyncio
     async def test_sp500(self, market_index):
         results = await market_index.api_function(index_symbol="^GSPC", period="5d")
         assert len(results) == 1
@@ -124,7 +179,6 @@ class TestUSMarketIndex:
         assert "Close" in r.data.columns
         assert "S&P 500" in r.name
 
-    @pytest.mark.asyncio
     async def test_nasdaq(self, market_index):
         results = await market_index.api_function(index_symbol="^IXIC", period="5d")
         r = results[0]
@@ -61,8 +61,9 @@ class TestToolMetadata:
         assert holding_tool.name == "Shareholding structure"
 
 
+@pytest.mark.integration
+@pytest.mark.usefixtures("shared_tickers")
 class TestUSProfileViaMarketFlag:
-    @pytest.mark.asyncio
     async def test_valid_ticker(self, profile_tool):
         results = await profile_tool.api_function(stock_code=VALID_TICKER, market="US")
         assert isinstance(results, list) and len(results) == 1
@@ -71,15 +72,15 @@ class TestUSProfileViaMarketFlag:
         assert isinstance(r.data, dict)
         assert r.data["ticker"] == VALID_TICKER
 
-    @pytest.mark.asyncio
     async def test_invalid_ticker(self, profile_tool):
         results = await profile_tool.api_function(stock_code=INVALID_TICKER, market="US")
         assert isinstance(results, list) and len(results) == 1
         assert isinstance(results[0], ToolResult)
 
 
+@pytest.mark.integration
+@pytest.mark.usefixtures("shared_tickers")
 class TestUSPriceViaMarketFlag:
-    @pytest.mark.asyncio
     async def test_valid_ticker(self, price_tool):
         results = await price_tool.api_function(stock_code=VALID_TICKER, market="US", period="1mo")
         r = results[0]
@@ -89,8 +90,9 @@ class TestUSPriceViaMarketFlag:
         assert "Close" in r.data.columns
 
 
+@pytest.mark.integration
+@pytest.mark.usefixtures("shared_tickers")
 class TestUSStatementsViaMarketFlag:
-    @pytest.mark.asyncio
     async def test_balance_sheet(self, balance_tool):
         results = await balance_tool.api_function(stock_code=VALID_TICKER, market="US")
         r = results[0]
@@ -98,7 +100,6 @@ class TestUSStatementsViaMarketFlag:
         assert isinstance(r.data, pd.DataFrame)
         assert not r.data.empty
 
-    @pytest.mark.asyncio
     async def test_income_statement(self, income_tool):
         results = await income_tool.api_function(stock_code=VALID_TICKER, market="US")
         r = results[0]
@@ -106,7 +107,6 @@ class TestUSStatementsViaMarketFlag:
         assert isinstance(r.data, pd.DataFrame)
         assert not r.data.empty
 
-    @pytest.mark.asyncio
     async def test_cashflow_statement(self, cashflow_tool):
         results = await cashflow_tool.api_function(stock_code=VALID_TICKER, market="US")
         r = results[0]
@@ -115,8 +115,9 @@ class TestUSStatementsViaMarketFlag:
         assert not r.data.empty
 
 
+@pytest.mark.integration
+@pytest.mark.usefixtures("shared_tickers")
 class TestUSShareholdingViaMarketFlag:
-    @pytest.mark.asyncio
     async def test_valid_ticker(self, holding_tool):
         results = await holding_tool.api_function(stock_code=VALID_TICKER, market="US")
         assert isinstance(results, list) and len(results) == 1
@@ -124,3 +125,215 @@ class TestUSShareholdingViaMarketFlag:
         assert isinstance(r, ToolResult)
         # Depending on upstream availability, data can be dict or None.
         assert isinstance(r.data, (dict, type(None)))
+
+
+class TestYFinanceInfoMemo:
+    """Profile and valuation tools share one ``.info`` fetch per ticker."""
+
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        import collections
+        import src.tools.financial.stock as stock_mod
+
+        calls = []
+
+        class _FakeTicker:
+            def __init__(self, code):
+                self.code = code
+
+            @property
+            def info(self):
+                calls.append(self.code)
+                return {"regularMarketPrice": 1.0, "shortName": "Fake"}
+
+        monkeypatch.setattr(stock_mod, "yf", type("yf", (), {"Ticker": _FakeTicker}))
+        monkeypatch.setattr(stock_mod, "_yf_info_cache", collections.OrderedDict())
+        return calls
+
+    async def test_info_fetched_once(self, calls):
+        import src.tools.financial.stock as stock_mod
+
+        first = await stock_mod._yf_info("fake")
+        second = await stock_mod._yf_info("FAKE")
+        assert first is second
+        assert calls == ["fake"]
+
+    async def test_info_expires_after_ttl(self, calls, monkeypatch):
+        import src.tools.financial.stock as stock_mod
+
+        now = [1000.0]
+        monkeypatch.setattr(stock_mod.time, "monotonic", lambda: now[0])
+        await stock_mod._yf_info("fake")
+        now[0] += stock_mod.PROFILE_CACHE_TTL
+        await stock_mod._yf_info("fake")
+        assert calls == ["fake", "fake"]
+
+    async def test_cache_is_bounded(self, calls, monkeypatch):
+        import src.tools.financial.stock as stock_mod
+
+        monkeypatch.setattr(stock_mod, "YF_INFO_CACHE_SIZE", 2)
+        for code in ("a", "b", "a", "c"):
+            await stock_mod._yf_info(code)
+        assert list(stock_mod._yf_info_cache) == ["A", "C"]
+        assert calls == ["a", "b", "c"]
+
+
+class TestHKHolderRows:
+    """Eastmoney holder rows are projected identically with and without ijson."""
+
+    BODY = (
+        b'{"version":"v","result":{"pages":1,"data":[{"HOLDER_NAME":"A","TOTAL_SHARES":10,'
+        b'"TOTAL_SHARES_RATIO":1.5,"HOLD_IDENTITY":"x","IS_ZJ":"1","EXTRA":[1,2]}],"count":1},'
+        b'"success":true}'
+    )
+
+    class _Content:
+        def __init__(self, body):
+            self.body = body
+
+        async def read(self, n=-1):
+            n = len(self.body) if n < 0 else n
+            chunk, self.body = self.body[:n], self.body[n:]
+            return chunk
+
+    class _Response:
+        def __init__(self, body):
+            self.content = TestHKHolderRows._Content(body)
+
+        async def read(self):
+            return await self.content.read()
+
+    @pytest.mark.parametrize("streaming", [True, False])
+    async def test_rows_projected(self, monkeypatch, streaming):
+        import src.tools.financial.stock as stock_mod
+
+        if streaming and stock_mod.ijson is None:
+            pytest.skip("ijson not installed")
+        if not streaming:
+            monkeypatch.setattr(stock_mod, "ijson", None)
+
+        rows = await stock_mod._read_hk_holder_rows(self._Response(self.BODY))
+        assert rows == [{
+            "holder_name": "A",
+            "shares": 10,
+            "ownership_pct": 1.5,
+            "ownership_type": "x",
+            "is_direct": "1",
+        }]
+
+
+class TestPickInfo:
+    def test_profile_fields(self):
+        import src.tools.financial.stock as stock_mod
+
+        info = {"shortName": "", "longName": "Apple Inc.", "sector": "Tech", "marketCap": 0}
+        data = stock_mod._pick_info(info, "aapl", stock_mod._US_PROFILE_FIELDS)
+        assert data["ticker"] == "AAPL"
+        assert data["name"] == "Apple Inc."
+        assert data["sector"] == "Tech"
+        assert data["industry"] == ""
+        assert data["market_cap"] == 0
+        assert data["enterprise_value"] is None
+        assert list(data) == ["ticker"] + [f[0] for f in stock_mod._US_PROFILE_FIELDS]
+
+
+class TestUSStatementCache:
+    async def test_statement_fetched_once(self, tmp_path, monkeypatch):
+        import src.tools.cache as cache_mod
+        import src.tools.financial.company_statements as statements_mod
+
+        monkeypatch.setenv("FINSIGHT_CACHE_DIR", str(tmp_path))
+        monkeypatch.delenv("FINSIGHT_TOOL_CACHE", raising=False)
+        monkeypatch.setattr(cache_mod, "_cache", None)
+
+        calls = []
+
+        class _FakeTicker:
+            def __init__(self, code):
+                self.code = code
+
+            @property
+            def balance_sheet(self):
+                calls.append(self.code)
+                return pd.DataFrame(
+                    {pd.Timestamp("2024-12-31"): [2_000_000.0]}, index=["Total Assets"]
+                )
+
+        monkeypatch.setattr(statements_mod, "yf", type("yf", (), {"Ticker": _FakeTicker}))
+
+        tool = BalanceSheet()
+        first = await tool.api_function(stock_code="FAKE", market="US")
+        second = await tool.api_function(stock_code="FAKE", market="US")
+        assert calls == ["FAKE"]
+        pd.testing.assert_frame_equal(first[0].data, second[0].data)
+
+
+class TestPrefetchCompanyData:
+    async def test_runs_tools_concurrently_and_drops_errors(self, monkeypatch):
+        import asyncio
+        from src.tools.base import Tool
+        import src.tools.financial.prefetch as prefetch_mod
+
+        running = []
+        peak = []
+
+        class _Ok(Tool):
+            def __init__(self):
+                super().__init__(name="ok", description="", parameters=[])
+
+            async def api_function(self, stock_code, market):
+                running.append(1)
+                peak.append(len(running))
+                await asyncio.sleep(0.01)
+                running.pop()
+                return [ToolResult(name=self.name, description="", data={"code": stock_code})]
+
+        class _Ok2(_Ok):
+            def __init__(self):
+                Tool.__init__(self, name="ok2", description="", parameters=[])
+
+        class _Boom(Tool):
+            def __init__(self):
+                super().__init__(name="boom", description="", parameters=[])
+
+            async def api_function(self, stock_code, market):
+                raise RuntimeError("unexpected")
+
+        monkeypatch.setattr(prefetch_mod, "PREFETCH_TOOLS", (_Ok, _Ok2, _Boom))
+        results = await prefetch_mod.prefetch_company_data("AAPL", "US")
+        assert set(results) == {"ok", "ok2"}
+        assert results["ok"][0].data == {"code": "AAPL"}
+        assert max(peak) == 2
+
+
+class TestPrepareUSStatement:
+    def test_matches_transpose_pipeline(self):
+        import numpy as np
+        from src.tools.financial.company_statements import _prepare_us_statement_df
+
+        statement = pd.DataFrame(
+            {
+                pd.Timestamp("2024-12-31"): [391_035_000_000.0, np.nan],
+                pd.Timestamp("2022-12-31"): [394_328_000_000.0, 1_234_567.0],
+                pd.Timestamp("2023-12-31"): [383_285_000_000.0, 7_654_321.0],
+            },
+            index=["Total Revenue", "Other"],
+        )
+
+        # Reference: the original transpose -> scale -> transpose implementation.
+        expected = statement.T.sort_index()
+        expected = (expected / 1_000_000).round(2)
+        expected.index = expected.index.strftime("%Y")
+        expected = expected.T
+        expected.index.name = "Item (USD millions)"
+        expected = expected.reset_index()
+
+        result = _prepare_us_statement_df(statement)
+        assert list(result.columns) == ["Item (USD millions)", "2022", "2023", "2024"]
+        pd.testing.assert_frame_equal(result, expected, check_names=False)
+
+    def test_empty_returns_none(self):
+        from src.tools.financial.company_statements import _prepare_us_statement_df
+
+        assert _prepare_us_statement_df(pd.DataFrame()) is None
+        assert _prepare_us_statement_df(None) is None